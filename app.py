@@ -2,20 +2,33 @@ import os
 import gradio as gr
 from lightning.app import LightningFlow, LightningApp
 from components.orchestrator import EnhancedOrchestratorAgent
+from monitoring.health_check import HealthMonitor
+from monitoring.admission_control import AdmissionController
 
 class WebInterface(LightningFlow):
     def __init__(self):
         super().__init__()
         self.orchestrator = EnhancedOrchestratorAgent()
+        self.health_monitor = HealthMonitor()
+        self.admission = AdmissionController(
+            self.orchestrator,
+            self.health_monitor,
+            max_in_flight=int(os.getenv("MAX_IN_FLIGHT_REQUESTS", "16"))
+        )
 
     def setup_interface(self):
         interface = gr.Interface(
-            fn=self.orchestrator.process_request,
+            fn=self.admission.process_request,
             inputs=[
                 gr.Textbox(
                     label="Request",
                     placeholder="Describe what you want to implement...",
                     lines=3
+                ),
+                gr.Dropdown(
+                    label="Priority",
+                    choices=["high", "normal", "low"],
+                    value="normal"
                 )
             ],
             outputs=[
@@ -30,10 +43,10 @@ class WebInterface(LightningFlow):
             3. Implements a solution using DeepSeek
             4. Provides comprehensive documentation""",
             examples=[
-                ["Implement a secure JWT authentication system in Python"],
-                ["Create a Redis caching layer for a REST API"],
-                ["Implement a rate limiting middleware for Express.js"],
-                ["Build a connection pool for PostgreSQL with proper error handling"]
+                ["Implement a secure JWT authentication system in Python", "normal"],
+                ["Create a Redis caching layer for a REST API", "normal"],
+                ["Implement a rate limiting middleware for Express.js", "normal"],
+                ["Build a connection pool for PostgreSQL with proper error handling", "normal"]
             ]
         )
         return interface
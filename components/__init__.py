@@ -1,5 +1,13 @@
 from .agents import ResearchAgent, CodingAgent
 from .documentation import EnhancedDocumentation
 from .memory_manager import MemoryOptimizer
+from .routing import ComplexityRouter
+from .context_manager import ContextManager
+from .tiered_storage import TieredMemoryStore
+from .access_log import AccessLog
+from .snapshot import DocumentSnapshot
+from .snippet_store import SnippetStore
+from .query_decomposition import decompose_query
+from .rate_limiter import RateLimiter
 
-__all__ = ['ResearchAgent', 'CodingAgent', 'EnhancedDocumentation', 'MemoryOptimizer']
\ No newline at end of file
+__all__ = ['ResearchAgent', 'CodingAgent', 'EnhancedDocumentation', 'MemoryOptimizer', 'ComplexityRouter', 'ContextManager', 'TieredMemoryStore', 'AccessLog', 'DocumentSnapshot', 'SnippetStore', 'decompose_query', 'RateLimiter']
\ No newline at end of file
@@ -0,0 +1,152 @@
+from typing import Dict, Any, Optional
+from array import array
+import json
+import math
+import os
+import threading
+import time
+
+class AccessLog:
+    """Compact, array-backed access and success counters per document id
+
+    Each document gets a slot in parallel arrays holding an exponentially
+    decayed access score, the time of its last update and raw hit, served
+    and accepted counts.
+    """
+    EVENTS = ('hit', 'served', 'accepted')
+
+    def __init__(self, path: Optional[str] = None, half_life_days: float = 7.0,
+                 snapshot_interval_seconds: int = 300):
+        self.path = path
+        # Ingest workers, fan-out searches and refreshes record concurrently
+        self.lock = threading.RLock()
+        self.config = {
+            'half_life_seconds': half_life_days * 24 * 3600,
+            'snapshot_interval_seconds': snapshot_interval_seconds,
+            'frequency_saturation': 5.0
+        }
+        self.slots = {}
+        self.ids = []
+        self.scores = array('d')
+        self.updated_at = array('d')
+        self.counts = {event: array('L') for event in self.EVENTS}
+        self.last_snapshot = time.time()
+
+        if path:
+            self.load()
+
+    def record(self, doc_id: Optional[str], event: str = 'hit') -> None:
+        """Record a hit (returned by search), served (sent to a user) or accepted event"""
+        if not doc_id:
+            return
+        if event not in self.EVENTS:
+            raise ValueError(f"Unknown access event '{event}', expected one of {self.EVENTS}")
+
+        with self.lock:
+            slot = self._get_slot(doc_id)
+            now = time.time()
+            self.counts[event][slot] += 1
+
+            # Only hits and serves count towards access frequency
+            if event != 'accepted':
+                self.scores[slot] = self._decayed_score(slot, now) + 1.0
+                self.updated_at[slot] = now
+
+            self.maybe_snapshot()
+
+    def get_frequency(self, doc_id: str) -> float:
+        """Decayed access frequency normalized to [0, 1)"""
+        with self.lock:
+            slot = self.slots.get(doc_id)
+            if slot is None:
+                return 0.0
+            score = self._decayed_score(slot, time.time())
+            return score / (score + self.config['frequency_saturation'])
+
+    def get_success_rate(self, doc_id: str) -> float:
+        """Share of serves that were accepted, with a neutral prior for unseen docs"""
+        with self.lock:
+            slot = self.slots.get(doc_id)
+            if slot is None:
+                return 0.5
+            return (self.counts['accepted'][slot] + 1) / (self.counts['served'][slot] + 2)
+
+    def get_last_access(self, doc_id: str) -> Optional[float]:
+        """Epoch seconds of the last recorded access, if any"""
+        with self.lock:
+            slot = self.slots.get(doc_id)
+            if slot is None or not self.updated_at[slot]:
+                return None
+            return self.updated_at[slot]
+
+    def get_stats(self, doc_id: str) -> Dict[str, Any]:
+        """Counters for a single document"""
+        with self.lock:
+            slot = self.slots.get(doc_id)
+            if slot is None:
+                return {event: 0 for event in self.EVENTS}
+            return {
+                **{event: self.counts[event][slot] for event in self.EVENTS},
+                'frequency': self.get_frequency(doc_id),
+                'success_rate': self.get_success_rate(doc_id)
+            }
+
+    def maybe_snapshot(self) -> None:
+        """Persist counters if the snapshot interval has elapsed"""
+        if self.path and time.time() - self.last_snapshot >= self.config['snapshot_interval_seconds']:
+            self.save()
+
+    def save(self) -> None:
+        """Write ids as a JSON header line followed by the raw array bytes"""
+        if not self.path:
+            return
+
+        with self.lock:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(json.dumps(self.ids).encode() + b"\n")
+                self.scores.tofile(f)
+                self.updated_at.tofile(f)
+                for event in self.EVENTS:
+                    self.counts[event].tofile(f)
+            os.replace(tmp_path, self.path)
+            self.last_snapshot = time.time()
+
+    def load(self) -> None:
+        """Restore counters from the last snapshot, if one exists"""
+        try:
+            with open(self.path, "rb") as f:
+                ids = json.loads(f.readline())
+                size = len(ids)
+                scores, updated_at = array('d'), array('d')
+                scores.fromfile(f, size)
+                updated_at.fromfile(f, size)
+                counts = {event: array('L') for event in self.EVENTS}
+                for event in self.EVENTS:
+                    counts[event].fromfile(f, size)
+        except (OSError, ValueError, EOFError):
+            return
+
+        with self.lock:
+            self.ids = ids
+            self.slots = {doc_id: slot for slot, doc_id in enumerate(ids)}
+            self.scores, self.updated_at, self.counts = scores, updated_at, counts
+
+    def _get_slot(self, doc_id: str) -> int:
+        """Slot for a document, appending a new one to every array; call under the lock"""
+        slot = self.slots.get(doc_id)
+        if slot is None:
+            slot = len(self.ids)
+            self.slots[doc_id] = slot
+            self.ids.append(doc_id)
+            self.scores.append(0.0)
+            self.updated_at.append(0.0)
+            for event in self.EVENTS:
+                self.counts[event].append(0)
+        return slot
+
+    def _decayed_score(self, slot: int, now: float) -> float:
+        if not self.updated_at[slot]:
+            return self.scores[slot]
+        elapsed = max(0.0, now - self.updated_at[slot])
+        return self.scores[slot] * math.pow(0.5, elapsed / self.config['half_life_seconds'])
@@ -1,27 +1,70 @@
 import os
-from typing import Dict, Any, Optional
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 import json
 from langchain_community.tools import TavilySearchResults
 from letta.schemas.memory import ChatMemory
 from letta.schemas.llm_config import LLMConfig
 from .documentation import EnhancedDocumentation
+from .context_manager import ContextManager
+from .access_log import AccessLog
+from .snippet_store import SnippetStore
+from .query_decomposition import decompose_query
+from .rate_limiter import RateLimiter
 
 class ResearchAgent:
-    def __init__(self, client, shared_block, enhanced_features: Optional[Dict[str, bool]] = None):
+    def __init__(self, client, shared_block, enhanced_features: Optional[Dict[str, bool]] = None,
+                 context_manager: Optional[ContextManager] = None,
+                 access_log: Optional[AccessLog] = None,
+                 snippet_store: Optional[SnippetStore] = None,
+                 snapshot_path: Optional[str] = None):
         self.client = client
         self.shared_block = shared_block
-        self.search_tool = TavilySearchResults(
-            api_key=os.getenv("TAVILY_API_KEY"),
-            search_depth="advanced",
-            include_domains=[
-                "github.com",
-                "stackoverflow.com",
-                "python.org",
-                "docs.python.org",
-                "developer.mozilla.org"
-            ]
-        )
+        self.context_manager = context_manager
+        self.access_log = access_log
+        self.freshness_config = {
+            'fresh_days': 30,
+            'max_stale_days': 180,
+            'candidate_docs': 5
+        }
+        self.decomposition_config = {
+            'enabled': bool(enhanced_features and enhanced_features.get("query_decomposition")),
+            'max_sub_queries': 4,
+            'min_part_words': 2
+        }
+        
+        # Sub-query searches run concurrently so latency tracks the slowest one
+        self.fanout_executor = ThreadPoolExecutor(max_workers=self.decomposition_config['max_sub_queries'])
+        
+        # Background revalidation of stale documentation, one refresh per query at a time.
+        # Queued plus running refreshes are capped and their searches rate limited, so a
+        # burst of stale hits is dropped rather than piling up Tavily calls.
+        self.refresh_config = {
+            'workers': 2,
+            'max_pending': 16,
+            'searches_per_minute': 20
+        }
+        self.refresh_executor = ThreadPoolExecutor(max_workers=self.refresh_config['workers'])
+        self.refresh_rate_limiter = RateLimiter(self.refresh_config['searches_per_minute'])
+        self.refreshing = set()
+        self.refreshing_lock = threading.Lock()
+        
+        # Refreshes analyze on their own agent (created on first use) so they never
+        # share conversation turns or context resets with user requests
+        self.refresh_agent_state = None
+        self.refresh_agent_lock = threading.Lock()
+        
+        # Tavily tools per (search_depth, max_results); tool run() kwargs never reach the API
+        self.search_tools = {}
+        self.search_tools_lock = threading.Lock()
+        self.search_tool = self._get_search_tool("advanced", 10)
+        
+        # Conversation turns (context preparation + message) run one at a time per agent
+        self.agent_lock = threading.Lock()
         
         # Initialize agent with shared memory
         self.agent_state = self.client.create_agent(
@@ -35,7 +78,12 @@ class ResearchAgent:
         
         # Initialize documentation manager if enabled
         if enhanced_features and enhanced_features.get("documentation_storage"):
-            self.docs = EnhancedDocumentation(client, self.agent_state.id)
+            self.docs = EnhancedDocumentation(
+                client,
+                self.agent_state.id,
+                snapshot_path=snapshot_path,
+                snippet_store=snippet_store
+            )
 
     def _get_research_persona(self) -> str:
         return """You are an advanced research agent specialized in technical research and documentation.
@@ -48,26 +96,134 @@ class ResearchAgent:
         6. Share findings through shared memory
         7. Validate and update stored information"""
 
-    async def research(self, query: str) -> Dict[str, Any]:
+    async def research(self, query: str, search_config: Optional[Dict[str, Any]] = None,
+                       store: bool = True) -> Dict[str, Any]:
+        search_config = search_config or {}
+
         # Check existing documentation first
         if hasattr(self, 'docs'):
-            existing_docs = await self.docs.search_documentation(query)
-            if existing_docs:
-                recent_docs = [doc for doc in existing_docs 
-                             if (datetime.now() - datetime.fromisoformat(doc['metadata']['timestamp'])).days < 30]
-                if recent_docs:
-                    return self._prepare_documented_response(recent_docs[0])
-
-        # Perform research using Tavily
-        search_results = self.search_tool.run(
+            existing_docs = await self.docs.search_documentation(
+                query, limit=self.freshness_config['candidate_docs']
+            )
+            doc = self._select_documented(existing_docs, self.freshness_config['max_stale_days'])
+            if doc:
+                self._record_access(doc, "hit")
+                stale = self._get_age_days(doc) >= self.freshness_config['fresh_days']
+                # Serve aging documentation now and revalidate it off the critical path
+                if stale:
+                    self._schedule_refresh(query, doc, search_config)
+                self._record_access(doc, "served")
+                return self._prepare_documented_response(doc, stale=stale)
+
+        sub_queries = self._decompose_query(query) if self.decomposition_config['enabled'] else [query]
+        if len(sub_queries) > 1:
+            search_results = await self._fan_out_search(sub_queries, search_config)
+        else:
+            search_results = self._search(query, search_config)
+
+        findings = self._analyze(query, search_results)
+        if len(sub_queries) > 1:
+            findings["sub_queries"] = sub_queries
+
+        # Store findings if documentation is enabled (bulk ingest stores in batches)
+        if store and hasattr(self, 'docs'):
+            await self.docs.store_documentation(**self.build_documentation_entry(findings))
+
+        return findings
+
+    def _search(self, query: str, search_config: Dict[str, Any]) -> Any:
+        """Perform research using Tavily"""
+        search_tool = self._get_search_tool(
+            search_config.get("search_depth", "advanced"),
+            search_config.get("max_results", 10)
+        )
+        return search_tool.run(query)
+
+    def _get_search_tool(self, search_depth: str, max_results: int) -> TavilySearchResults:
+        """Get (or create) a Tavily tool configured for a tier's depth and result count"""
+        key = (search_depth, max_results)
+        with self.search_tools_lock:
+            if key not in self.search_tools:
+                self.search_tools[key] = TavilySearchResults(
+                    api_key=os.getenv("TAVILY_API_KEY"),
+                    search_depth=search_depth,
+                    max_results=max_results,
+                    include_domains=[
+                        "github.com",
+                        "stackoverflow.com",
+                        "python.org",
+                        "docs.python.org",
+                        "developer.mozilla.org"
+                    ]
+                )
+            return self.search_tools[key]
+
+    def _decompose_query(self, query: str) -> List[str]:
+        """Split a multi-part request into sub-queries that each stand on their own"""
+        return decompose_query(
             query,
-            search_parameters={
-                "max_results": 10,
-                "sort_by": "relevance"
-            }
+            max_sub_queries=self.decomposition_config['max_sub_queries'],
+            min_part_words=self.decomposition_config['min_part_words']
         )
 
-        # Process and analyze findings
+    async def _fan_out_search(self, sub_queries: List[str], search_config: Dict[str, Any]) -> List[Any]:
+        """Search sub-queries concurrently and merge them into one ranked, de-duplicated set"""
+        loop = asyncio.get_running_loop()
+        result_sets = await asyncio.gather(*(
+            loop.run_in_executor(self.fanout_executor, self._search_sub_query, sub_query, search_config)
+            for sub_query in sub_queries
+        ))
+        return self._merge_results(result_sets, search_config.get("max_results", 10))
+
+    def _search_sub_query(self, sub_query: str, search_config: Dict[str, Any]) -> List[Any]:
+        """Reuse fresh documented results for a sub-query, otherwise search Tavily"""
+        if hasattr(self, 'docs'):
+            existing_docs = asyncio.run(self.docs.search_documentation(
+                sub_query, limit=self.freshness_config['candidate_docs']
+            ))
+            doc = self._select_documented(existing_docs, self.freshness_config['fresh_days'])
+            if doc:
+                results = self.docs.resolve_results(doc)
+                if isinstance(results, list):
+                    self._record_access(doc, "hit")
+                    return results
+        
+        results = self._search(sub_query, search_config)
+        return results if isinstance(results, list) else []
+
+    def _select_documented(self, docs: List[Dict[str, Any]], max_age_days: int) -> Optional[Dict[str, Any]]:
+        """Best ranked fresh candidate, else the best ranked one younger than ``max_age_days``"""
+        candidates = [doc for doc in docs if self._get_age_days(doc) < max_age_days]
+        fresh = [doc for doc in candidates if self._get_age_days(doc) < self.freshness_config['fresh_days']]
+        return (fresh or candidates or [None])[0]
+
+    def _get_age_days(self, doc: Dict[str, Any]) -> int:
+        return (datetime.now() - datetime.fromisoformat(doc['metadata']['timestamp'])).days
+
+    def _merge_results(self, result_sets: List[List[Any]], max_results: int) -> List[Any]:
+        """Interleave each sub-query's best results, dropping duplicate URLs"""
+        ranked_sets = [
+            sorted(results, key=lambda r: r.get("score", 0) if isinstance(r, dict) else 0, reverse=True)
+            for results in result_sets
+        ]
+        merged, seen_urls = [], set()
+        for rank in range(max((len(results) for results in ranked_sets), default=0)):
+            for results in ranked_sets:
+                if rank >= len(results):
+                    continue
+                result = results[rank]
+                url = result.get("url") if isinstance(result, dict) else None
+                if url and url in seen_urls:
+                    continue
+                if url:
+                    seen_urls.add(url)
+                merged.append(result)
+                if len(merged) >= max_results:
+                    return merged
+        return merged
+
+    def _analyze(self, query: str, search_results: Any, background: bool = False) -> Dict[str, Any]:
+        """Process and analyze findings, on the refresh agent for background refreshes"""
         analysis_prompt = f"""Analyze these search results and provide:
         1. Key technical insights
         2. Best practices identified
@@ -77,13 +233,18 @@ class ResearchAgent:
         Search results:
         {json.dumps(search_results, indent=2)}"""
 
-        response = self.client.send_message(
-            agent_id=self.agent_state.id,
-            message=analysis_prompt,
-            role="user"
-        )
+        with self.refresh_agent_lock if background else self.agent_lock:
+            agent_state = self._get_refresh_agent() if background else self.agent_state
+            if self.context_manager:
+                analysis_prompt = self.context_manager.build_message(agent_state, analysis_prompt)
 
-        findings = {
+            response = self.client.send_message(
+                agent_id=agent_state.id,
+                message=analysis_prompt,
+                role="user"
+            )
+
+        return {
             "query": query,
             "timestamp": str(datetime.now()),
             "results": search_results,
@@ -92,19 +253,67 @@ class ResearchAgent:
             "best_practices": self._extract_best_practices(response.messages[-1].content)
         }
 
-        # Store findings if documentation is enabled
-        if hasattr(self, 'docs'):
-            await self.docs.store_documentation(
-                doc_type="research_findings",
-                content=findings,
-                metadata={
-                    "query": query,
-                    "timestamp": str(datetime.now()),
-                    "source": "tavily"
-                }
+    def _get_refresh_agent(self):
+        """Get (or create) the agent background refreshes analyze with; call under refresh_agent_lock"""
+        if self.refresh_agent_state is None:
+            self.refresh_agent_state = self.client.create_agent(
+                name="research_refresh_agent",
+                memory=ChatMemory(
+                    human="",
+                    persona=self._get_research_persona()
+                ),
+                tools=[self.search_tool.name]
             )
+        return self.refresh_agent_state
 
-        return findings
+    def _schedule_refresh(self, query: str, doc: Dict[str, Any], search_config: Dict[str, Any]) -> None:
+        """Queue a background revalidation unless one is pending for this query or the queue is full"""
+        with self.refreshing_lock:
+            if query in self.refreshing or len(self.refreshing) >= self.refresh_config['max_pending']:
+                return
+            self.refreshing.add(query)
+        self.refresh_executor.submit(asyncio.run, self._refresh(query, doc, search_config))
+
+    async def _refresh(self, query: str, doc: Dict[str, Any], search_config: Dict[str, Any]) -> None:
+        """Re-run the search and re-analyze only if the result set changed"""
+        try:
+            self.refresh_rate_limiter.acquire()
+            search_results = self._search(query, search_config)
+            previous_results = self.docs.resolve_results(doc)
+            if self._results_fingerprint(search_results) == self._results_fingerprint(previous_results):
+                findings = {**doc["content"], "timestamp": str(datetime.now())}
+            else:
+                findings = self._analyze(query, search_results, background=True)
+            await self.docs.store_documentation(**self.build_documentation_entry(findings))
+        except Exception as e:
+            print(f"Documentation refresh failed for '{query}': {e}")
+        finally:
+            with self.refreshing_lock:
+                self.refreshing.discard(query)
+
+    def _results_fingerprint(self, results: Any) -> str:
+        """Order-insensitive hash of a result set by URL and content"""
+        if not isinstance(results, list):
+            return hashlib.sha256(json.dumps(results, sort_keys=True, default=str).encode()).hexdigest()
+        item_hashes = sorted(
+            hashlib.sha256(f"{item.get('url', '')}\n{item.get('content', '')}".encode()).hexdigest()
+            if isinstance(item, dict) else
+            hashlib.sha256(json.dumps(item, default=str).encode()).hexdigest()
+            for item in results
+        )
+        return hashlib.sha256("".join(item_hashes).encode()).hexdigest()
+
+    def build_documentation_entry(self, findings: Dict[str, Any]) -> Dict[str, Any]:
+        """Arguments for storing research findings as documentation"""
+        return {
+            "doc_type": "research_findings",
+            "content": findings,
+            "metadata": {
+                "query": findings["query"],
+                "timestamp": str(datetime.now()),
+                "source": "tavily"
+            }
+        }
 
     def _extract_categories(self, text: str) -> List[str]:
         categories = set()
@@ -131,30 +340,46 @@ class ResearchAgent:
                 practices.append(line.strip())
         return practices
 
-    def _prepare_documented_response(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+    def _record_access(self, doc: Dict[str, Any], event: str) -> None:
+        if self.access_log:
+            self.access_log.record(doc.get("id"), event)
+
+    def _prepare_documented_response(self, doc: Dict[str, Any], stale: bool = False) -> Dict[str, Any]:
         return {
+            "doc_id": doc.get("id"),
             "query": doc["metadata"]["query"],
             "timestamp": doc["metadata"]["timestamp"],
-            "results": doc["content"]["results"],
+            "results": self.docs.resolve_results(doc),
             "summary": doc["content"]["summary"],
             "source": "documentation",
+            "stale": stale,
             "categories": doc["content"].get("categories", []),
             "best_practices": doc["content"].get("best_practices", [])
         }
 
 class CodingAgent:
-    def __init__(self, client, shared_block, model_config: Optional[LLMConfig] = None):
+    def __init__(self, client, shared_block, model_config: Optional[LLMConfig] = None,
+                 context_manager: Optional[ContextManager] = None):
         self.client = client
         self.shared_block = shared_block
+        self.context_manager = context_manager
         
+        llm_config = model_config or self._get_default_config()
         self.agent_state = self.client.create_agent(
             name="coding_agent",
             memory=ChatMemory(
                 human="",
                 persona=self._get_coding_persona()
             ),
-            llm_config=model_config or self._get_default_config()
+            llm_config=llm_config
         )
+        
+        # Agents per (model, max_tokens) pair, created lazily for routed tiers
+        self.tier_agents = {self._get_config_key(llm_config): self.agent_state}
+        self.tier_agents_lock = threading.Lock()
+        
+        # Conversation turns (context preparation + message) run one at a time per agent
+        self.agent_locks = {self.agent_state.id: threading.Lock()}
 
     def _get_coding_persona(self) -> str:
         return """You are an expert programming assistant with access to research insights.
@@ -167,22 +392,54 @@ class CodingAgent:
         6. Provide comprehensive documentation
         7. Include error handling and edge cases"""
 
-    def _get_default_config(self) -> LLMConfig:
+    def _get_default_config(self, model_name: str = "deepseek-v2.5", max_tokens: int = 4096) -> LLMConfig:
         return LLMConfig(
             model_provider="openai",
-            model_name="deepseek-v2.5",
+            model_name=model_name,
             api_key=os.getenv("DEEPSEEK_API_KEY"),
             api_base="https://api.deepseek.com/v1",
             model_kwargs={
                 "temperature": 0.7,
                 "top_p": 0.95,
-                "max_tokens": 4096,
+                "max_tokens": max_tokens,
                 "frequency_penalty": 0.1,
                 "presence_penalty": 0.1
             }
         )
 
-    async def implement(self, research_findings: Dict[str, Any], request: str) -> Dict[str, Any]:
+    def _get_config_key(self, config: Any) -> tuple:
+        if isinstance(config, dict):
+            return (config.get("model_name"), config.get("model_kwargs", {}).get("max_tokens"))
+        return (config.model_name, config.model_kwargs.get("max_tokens"))
+
+    def _get_agent_for_tier(self, tier_config: Optional[Dict[str, Any]]):
+        """Get (or create) the agent serving a routed tier's model settings"""
+        if not tier_config:
+            return self.agent_state
+
+        llm_config = self._get_default_config(
+            model_name=tier_config["model_name"],
+            max_tokens=tier_config["max_tokens"]
+        )
+        key = self._get_config_key(llm_config)
+        with self.tier_agents_lock:
+            if key not in self.tier_agents:
+                agent_state = self.client.create_agent(
+                    name=f"coding_agent_{tier_config.get('tier', len(self.tier_agents))}",
+                    memory=ChatMemory(
+                        human="",
+                        persona=self._get_coding_persona()
+                    ),
+                    llm_config=llm_config
+                )
+                self.agent_locks[agent_state.id] = threading.Lock()
+                self.tier_agents[key] = agent_state
+            return self.tier_agents[key]
+
+    async def implement(self, research_findings: Dict[str, Any], request: str,
+                        tier_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        agent_state = self._get_agent_for_tier(tier_config)
+
         # Create implementation prompt
         implementation_prompt = f"""Based on the following research and request, implement a solution:
 
@@ -204,11 +461,15 @@ class CodingAgent:
         6. Security notes (if applicable)
         7. Testing suggestions"""
 
-        response = self.client.send_message(
-            agent_id=self.agent_state.id,
-            message=implementation_prompt,
-            role="user"
-        )
+        with self.agent_locks[agent_state.id]:
+            if self.context_manager:
+                implementation_prompt = self.context_manager.build_message(agent_state, implementation_prompt)
+
+            response = self.client.send_message(
+                agent_id=agent_state.id,
+                message=implementation_prompt,
+                role="user"
+            )
 
         content = response.messages[-1].content
         explanation = content
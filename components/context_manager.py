@@ -0,0 +1,119 @@
+from typing import Dict, Any, List
+from datetime import datetime
+import json
+
+class ContextManager:
+    """Keeps agents' in-context message history under a token ceiling"""
+    MODES = ('isolated', 'rolling')
+
+    def __init__(self, client, mode: str = 'rolling', max_context_tokens: int = 8000):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown context mode '{mode}', expected one of {self.MODES}")
+
+        self.client = client
+        self.mode = mode
+        self.config = {
+            'max_context_tokens': max_context_tokens,
+            'summary_token_budget': max_context_tokens // 4,
+            'chars_per_token': 4,
+            'max_metric_samples': 1000
+        }
+        self.summaries = {}
+        self.metrics = {
+            'context_tokens': [],
+            'resets': 0
+        }
+
+    def prepare(self, agent_state) -> str:
+        """Bound the agent's context before a call; returns carried-over summary text"""
+        agent_id = agent_state.id
+        messages = self._get_messages(agent_id)
+        tokens = self._estimate_tokens(messages)
+
+        if self.mode == 'isolated':
+            if messages:
+                self._reset(agent_id)
+            tokens = 0
+        elif tokens > self.config['max_context_tokens']:
+            self.summaries[agent_id] = self._summarize(messages)
+            self._reset(agent_id)
+            tokens = self._estimate_text_tokens(self.summaries[agent_id])
+
+        self._record_context_size(agent_state, tokens)
+
+        # The summary is carried into the next message once, then lives in history
+        return self.summaries.pop(agent_id, "")
+
+    def build_message(self, agent_state, prompt: str) -> str:
+        """Prepare the agent's context and prefix the prompt with any rolling summary"""
+        summary = self.prepare(agent_state)
+        if not summary:
+            return prompt
+        return f"""Summary of earlier conversation:
+        {summary}
+
+        {prompt}"""
+
+    def get_context_stats(self) -> Dict[str, Any]:
+        """Summarize recorded context size per agent"""
+        stats = {}
+        for sample in self.metrics['context_tokens']:
+            agent_stats = stats.setdefault(sample['agent'], {'calls': 0, 'total_tokens': 0, 'max_tokens': 0})
+            agent_stats['calls'] += 1
+            agent_stats['total_tokens'] += sample['tokens']
+            agent_stats['max_tokens'] = max(agent_stats['max_tokens'], sample['tokens'])
+            agent_stats['last_tokens'] = sample['tokens']
+
+        for agent_stats in stats.values():
+            agent_stats['average_tokens'] = agent_stats.pop('total_tokens') / agent_stats['calls']
+
+        return {
+            'mode': self.mode,
+            'max_context_tokens': self.config['max_context_tokens'],
+            'resets': self.metrics['resets'],
+            'agents': stats
+        }
+
+    def _get_messages(self, agent_id: str) -> List[Any]:
+        return list(self.client.get_in_context_messages(agent_id) or [])
+
+    def _reset(self, agent_id: str) -> None:
+        self.client.reset_messages(agent_id)
+        self.metrics['resets'] += 1
+
+    def _message_text(self, message: Any) -> str:
+        text = getattr(message, 'text', None) or getattr(message, 'content', None) or ""
+        return text if isinstance(text, str) else json.dumps(text, default=str)
+
+    def _estimate_text_tokens(self, text: str) -> int:
+        return len(text) // self.config['chars_per_token']
+
+    def _estimate_tokens(self, messages: List[Any]) -> int:
+        return sum(self._estimate_text_tokens(self._message_text(m)) for m in messages)
+
+    def _summarize(self, messages: List[Any]) -> str:
+        """Extractive summary of the most recent user/assistant turns within budget"""
+        budget = self.config['summary_token_budget'] * self.config['chars_per_token']
+        lines = []
+        for message in reversed(messages):
+            role = getattr(message, 'role', '')
+            if role not in ('user', 'assistant'):
+                continue
+            text = " ".join(self._message_text(message).split())
+            line = f"{role}: {text[:400]}"
+            if len(line) > budget:
+                break
+            lines.append(line)
+            budget -= len(line)
+        return "\n".join(reversed(lines))
+
+    def _record_context_size(self, agent_state, tokens: int) -> None:
+        self.metrics['context_tokens'].append({
+            'agent': getattr(agent_state, 'name', agent_state.id),
+            'tokens': tokens,
+            'timestamp': datetime.now()
+        })
+
+        # Keep only the most recent measurements
+        if len(self.metrics['context_tokens']) > self.config['max_metric_samples']:
+            self.metrics['context_tokens'] = self.metrics['context_tokens'][-self.config['max_metric_samples']:]
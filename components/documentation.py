@@ -1,21 +1,113 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Iterator, Callable
 from datetime import datetime
+import heapq
+import itertools
 import json
+from .tiered_storage import TieredMemoryStore
+from .snapshot import DocumentSnapshot
+from .snippet_store import SnippetStore
 
 class EnhancedDocumentation:
-    def __init__(self, client, agent_id: str):
+    def __init__(self, client, agent_id: str, tiered_store: Optional[TieredMemoryStore] = None,
+                 snapshot_path: Optional[str] = None, snippet_store: Optional[SnippetStore] = None):
         self.client = client
         self.agent_id = agent_id
+        self.tiered_store = tiered_store
+        self.snippet_store = snippet_store
+        self.snapshot = None
+        # Memory ids deleted or archived since the snapshot was exported
+        self.discarded_ids = set()
         self.score_weights = {
             'keyword_match': 0.4,
             'recency': 0.3,
             'complexity_match': 0.2,
             'category_match': 0.1
         }
+        self.search_config = {
+            'page_size': 100,
+            'default_limit': 10
+        }
+        
+        if snapshot_path:
+            self.load_snapshot(snapshot_path)
 
     async def store_documentation(self, doc_type: str, content: Dict[str, Any], metadata: Dict[str, Any]) -> None:
         """Store documentation with enhanced metadata and categorization"""
-        doc_data = {
+        doc_data = self._build_doc_data(doc_type, content, metadata)
+        
+        # Check for similar existing documents
+        similar_docs = await self.search_documentation(
+            json.dumps(content),
+            {"category": doc_data["metadata"]["category"]},
+            limit=1
+        )
+        
+        if similar_docs:
+            self._apply_version(doc_data, similar_docs[0])
+        
+        self._insert_doc(doc_data)
+
+    async def store_documentation_batch(self, entries: List[Dict[str, Any]]) -> None:
+        """Store several documents, resolving versions with one archival memory scan
+
+        Each entry holds the ``doc_type``, ``content`` and ``metadata`` arguments
+        of ``store_documentation``. Entries are also versioned against earlier
+        entries of the same batch.
+        """
+        docs = [self._build_doc_data(entry["doc_type"], entry["content"], entry["metadata"])
+                for entry in entries]
+        queries = []
+        for doc in docs:
+            query = json.dumps(doc["content"])
+            queries.append((query.lower().split(), self._assess_complexity({'content': query})))
+        best_matches = [None] * len(docs)
+        
+        existing_docs = self.iter_documentation(after=self.snapshot.last_memory_id if self.snapshot else None)
+        if self.snapshot:
+            existing_docs = itertools.chain(self.iter_snapshot_documentation(), existing_docs)
+        
+        for existing in existing_docs:
+            category = existing.get("metadata", {}).get("category")
+            matching = [i for i, doc_data in enumerate(docs) if doc_data["metadata"]["category"] == category]
+            if not matching:
+                continue
+            # Serialize each existing document once, however many entries it is scored against
+            existing_text = json.dumps(existing).lower()
+            for i in matching:
+                relevance_score = self._calculate_text_relevance(existing, existing_text, *queries[i])
+                if best_matches[i] is None or relevance_score > best_matches[i][0]:
+                    best_matches[i] = (relevance_score, existing)
+        
+        stored = []
+        for doc_data, match, query in zip(docs, best_matches, queries):
+            for earlier, earlier_text in stored:
+                if earlier["metadata"]["category"] != doc_data["metadata"]["category"]:
+                    continue
+                relevance_score = self._calculate_text_relevance(earlier, earlier_text, *query)
+                if match is None or relevance_score > match[0]:
+                    match = (relevance_score, earlier)
+            if match:
+                self._apply_version(doc_data, match[1])
+            self._insert_doc(doc_data)
+            stored.append((doc_data, json.dumps(doc_data).lower()))
+
+    def resolve_results(self, doc: Dict[str, Any]) -> List[Any]:
+        """Search results of a document, loading deduplicated snippets on demand"""
+        content = doc.get("content", {})
+        if "results" in content:
+            return content["results"]
+        if self.snippet_store and content.get("result_refs"):
+            return self.snippet_store.get_many(content["result_refs"])
+        return []
+
+    def _build_doc_data(self, doc_type: str, content: Dict[str, Any], metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Wrap content with enhanced metadata"""
+        # Search results are stored once in the snippet table and referenced by id
+        if self.snippet_store and isinstance(content.get("results"), list):
+            result_refs = self.snippet_store.put_many(content["results"])
+            content = {key: value for key, value in content.items() if key != "results"}
+            content["result_refs"] = result_refs
+        return {
             "type": doc_type,
             "content": content,
             "metadata": {
@@ -29,45 +121,203 @@ class EnhancedDocumentation:
                 "readability_score": self._calculate_readability(content)
             }
         }
-        
-        # Check for similar existing documents
-        similar_docs = await self.search_documentation(
-            json.dumps(content),
-            {"category": doc_data["metadata"]["category"]}
+
+    def _apply_version(self, doc_data: Dict[str, Any], similar_doc: Dict[str, Any]) -> None:
+        """Update existing document if similar"""
+        doc_data["metadata"]["version"] = self._increment_version(
+            similar_doc["metadata"]["version"]
         )
-        
-        if similar_docs:
-            # Update existing document if similar
-            doc_data["metadata"]["version"] = self._increment_version(
-                similar_docs[0]["metadata"]["version"]
-            )
-            doc_data["metadata"]["previous_version"] = similar_docs[0]["metadata"]["version"]
-        
+        doc_data["metadata"]["previous_version"] = similar_doc["metadata"]["version"]
+
+    def _insert_doc(self, doc_data: Dict[str, Any]) -> None:
         self.client.insert_archival_memory(
             self.agent_id,
-            f"DOCUMENTATION_{doc_type}_{doc_data['metadata']['category']}: {json.dumps(doc_data)}"
+            f"DOCUMENTATION_{doc_data['type']}_{doc_data['metadata']['category']}: {json.dumps(doc_data)}"
         )
 
-    async def search_documentation(self, query: str, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """Search documentation with advanced filtering and ranking"""
-        results = []
-        archival_memory = self.client.get_archival_memory(self.agent_id)
+    async def search_documentation(self, query: str, filters: Optional[Dict[str, Any]] = None,
+                                   limit: Optional[int] = None, offset: int = 0,
+                                   min_score: Optional[float] = None,
+                                   early_exit_score: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Search documentation with advanced filtering and ranking
+
+        Archival memory is consumed page by page while a bounded heap keeps only
+        the best ``offset + limit`` matches. Scanning stops early once the heap is
+        full of documents scoring at least ``early_exit_score``.
+        """
+        if limit is None:
+            limit = self.search_config['default_limit']
+        if limit <= 0:
+            return []
+        capacity = offset + limit
+        heap = []
+        counter = itertools.count()
         
-        for memory in archival_memory:
-            if not memory.text.startswith("DOCUMENTATION_"):
-                continue
+        def offer(relevance_score: float, doc_ref: Any) -> bool:
+            """Keep a candidate if it ranks; returns True once the early-exit cutoff is met"""
+            if min_score is not None and relevance_score < min_score:
+                return False
                 
-            try:
-                doc_data = json.loads(memory.text.split(": ", 1)[1])
-                if self._matches_filters(doc_data, filters):
-                    relevance_score = self._calculate_relevance(doc_data, query)
-                    results.append((doc_data, relevance_score))
-            except json.JSONDecodeError:
-                continue
+            # Ties keep the earliest stored document, matching a stable sort
+            entry = (relevance_score, -next(counter), doc_ref)
+            if len(heap) < capacity:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+                
+            return (early_exit_score is not None and len(heap) == capacity
+                    and heap[0][0] >= early_exit_score)
+        
+        # A loaded snapshot covers everything up to its last memory id
+        done = self._search_snapshot(query, filters, offer) if self.snapshot else False
+        if not done:
+            after = self.snapshot.last_memory_id if self.snapshot else None
+            for doc_data in self.iter_documentation(filters, after=after):
+                if offer(self._calculate_relevance(doc_data, query), doc_data):
+                    break
+        
+        # Fall back to archived tiers only when live memory can't fill the results
+        if self.tiered_store and len(heap) < capacity:
+            archived = self.tiered_store.search(
+                lambda doc: self._score_archived(doc, query, filters),
+                limit=capacity - len(heap),
+                min_score=min_score,
+                bound_fn=lambda metadata: self._bound_archived(metadata, query, filters)
+            )
+            for relevance_score, doc_data in archived:
+                heapq.heappush(heap, (relevance_score, -next(counter), doc_data))
         
-        # Sort by relevance score and extract just the documents
-        sorted_results = sorted(results, key=lambda x: x[1], reverse=True)
-        return [doc for doc, score in sorted_results]
+        # Snapshot candidates are ordinals, decoded only once they make the cut
+        ranked = sorted(heap, key=lambda x: x[:2], reverse=True)
+        return [self.snapshot.load(doc) if isinstance(doc, int) else doc
+                for score, _, doc in ranked[offset:capacity]]
+
+    def iter_documentation(self, filters: Optional[Dict[str, Any]] = None,
+                           after: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Stream decoded documentation entries from archival memory page by page"""
+        for memory in self._iter_archival_memory(after):
+            doc_data = self._decode_memory(memory)
+            if doc_data is not None and self._matches_filters(doc_data, filters):
+                yield doc_data
+
+    def iter_snapshot_documentation(self) -> Iterator[Dict[str, Any]]:
+        """Decode loaded snapshot documents that are still live"""
+        if not self.snapshot:
+            return
+        for ordinal in range(self.snapshot.count):
+            if not self._is_snapshot_entry_discarded(ordinal):
+                yield self.snapshot.load(ordinal)
+
+    def discard(self, memory_id: str) -> None:
+        """Stop serving a deleted or archived memory from the loaded snapshot"""
+        self.discarded_ids.add(memory_id)
+
+    def export_snapshot(self, path: str) -> int:
+        """Write the current documentation set to a memory-mapped snapshot file"""
+        last_seen = {'id': None}
+        
+        def docs() -> Iterator[Dict[str, Any]]:
+            for memory in self._iter_archival_memory():
+                last_seen['id'] = memory.id
+                doc_data = self._decode_memory(memory)
+                if doc_data is not None:
+                    yield doc_data
+        
+        return DocumentSnapshot.write(path, docs(), lambda: last_seen['id'])
+
+    def load_snapshot(self, path: str) -> None:
+        """Serve searches from a snapshot, reading only newer entries from archival memory"""
+        if self.snapshot:
+            self.snapshot.close()
+        self.snapshot = DocumentSnapshot(path)
+        self.discarded_ids = set()
+
+    def _iter_archival_memory(self, after: Optional[str] = None) -> Iterator[Any]:
+        page_size = self.search_config['page_size']
+        cursor = after
+        
+        while True:
+            page = self.client.get_archival_memory(self.agent_id, after=cursor, limit=page_size)
+            if not page:
+                return
+            yield from page
+            if len(page) < page_size:
+                return
+            cursor = page[-1].id
+
+    def _decode_memory(self, memory: Any) -> Optional[Dict[str, Any]]:
+        if not memory.text.startswith("DOCUMENTATION_"):
+            return None
+            
+        try:
+            doc_data = json.loads(memory.text.split(": ", 1)[1])
+        except (json.JSONDecodeError, IndexError):
+            return None
+            
+        doc_data.setdefault("id", getattr(memory, "id", None))
+        return doc_data
+
+    def _search_snapshot(self, query: str, filters: Optional[Dict[str, Any]],
+                         offer: Callable[[float, Any], bool]) -> bool:
+        """Score snapshot documents from their mapped fields without decoding them"""
+        query_terms = query.lower().split()
+        encoded_terms = [term.encode() for term in query_terms]
+        query_complexity = self._assess_complexity({'content': query})
+        
+        fast_filters = {key: value for key, value in (filters or {}).items()
+                        if key in ('category', 'complexity') and isinstance(value, str)}
+        other_filters = {key: value for key, value in (filters or {}).items() if key not in fast_filters}
+        
+        for entry in self.snapshot.iter_entries():
+            if any(getattr(entry, key) != value for key, value in fast_filters.items()):
+                continue
+            if self._is_snapshot_entry_discarded(entry.ordinal):
+                continue
+            if other_filters and not self._matches_filters(self.snapshot.load(entry.ordinal), other_filters):
+                continue
+                
+            keyword_score = self.snapshot.count_terms(entry.ordinal, encoded_terms) / len(query_terms)
+            relevance_score = self._combine_relevance(
+                keyword_score,
+                datetime.fromtimestamp(entry.timestamp),
+                entry.complexity,
+                entry.category,
+                query_terms,
+                query_complexity
+            )
+            if offer(relevance_score, entry.ordinal):
+                return True
+        return False
+
+    def _is_snapshot_entry_discarded(self, ordinal: int) -> bool:
+        """Whether a snapshot document was deleted or moved to the tiered archive"""
+        if not self.discarded_ids and not (self.tiered_store and self.tiered_store.index):
+            return False
+        memory_id = self.snapshot.get_memory_id(ordinal)
+        return memory_id in self.discarded_ids or bool(
+            self.tiered_store and memory_id in self.tiered_store.index
+        )
+
+    def _score_archived(self, doc: Dict[str, Any], query: str,
+                        filters: Optional[Dict[str, Any]]) -> Optional[float]:
+        """Score an archived entry, skipping non-documentation and filtered ones"""
+        if 'metadata' not in doc or not self._matches_filters(doc, filters):
+            return None
+        return self._calculate_relevance(doc, query)
+
+    def _bound_archived(self, metadata: Dict[str, Any], query: str,
+                        filters: Optional[Dict[str, Any]]) -> Optional[float]:
+        """Upper bound on an archived entry's score from its indexed metadata alone"""
+        if not self._matches_filters({'metadata': metadata}, filters):
+            return None
+        return self._combine_relevance(
+            1.0,
+            datetime.fromisoformat(metadata['timestamp']),
+            metadata['complexity'],
+            metadata['category'],
+            query.lower().split(),
+            self._assess_complexity({'content': query})
+        )
 
     def _increment_version(self, version: str) -> str:
         """Increment document version"""
@@ -94,22 +344,40 @@ class EnhancedDocumentation:
 
     def _calculate_relevance(self, doc: Dict[str, Any], query: str) -> float:
         """Calculate document relevance score"""
-        query_terms = query.lower().split()
-        doc_text = json.dumps(doc).lower()
-        
+        return self._calculate_text_relevance(
+            doc,
+            json.dumps(doc).lower(),
+            query.lower().split(),
+            self._assess_complexity({'content': query})
+        )
+
+    def _calculate_text_relevance(self, doc: Dict[str, Any], doc_text: str, query_terms: List[str],
+                                  query_complexity: str) -> float:
+        """Relevance from a document's pre-serialized lowercase text and a prepared query"""
         # Keyword matching score
         keyword_score = sum(term in doc_text for term in query_terms) / len(query_terms)
         
+        return self._combine_relevance(
+            keyword_score,
+            datetime.fromisoformat(doc['metadata']['timestamp']),
+            doc['metadata']['complexity'],
+            doc['metadata']['category'],
+            query_terms,
+            query_complexity
+        )
+
+    def _combine_relevance(self, keyword_score: float, timestamp: datetime, complexity: str,
+                           category: str, query_terms: List[str], query_complexity: str) -> float:
+        """Weight relevance components shared by live and snapshot search"""
         # Recency score
-        days_old = (datetime.now() - datetime.fromisoformat(doc['metadata']['timestamp'])).days
+        days_old = (datetime.now() - timestamp).days
         recency_score = max(0, 1 - (days_old / 365))
         
         # Complexity matching score (prefer documents matching query complexity)
-        query_complexity = self._assess_complexity({'content': query})
-        complexity_match = 1 if query_complexity == doc['metadata']['complexity'] else 0.5
+        complexity_match = 1 if query_complexity == complexity else 0.5
         
         # Category relevance
-        category_score = 1 if any(term in doc['metadata']['category'] for term in query_terms) else 0.5
+        category_score = 1 if any(term in category for term in query_terms) else 0.5
         
         # Weighted average of scores
         return (
@@ -0,0 +1,178 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+from .orchestrator import EnhancedOrchestratorAgent
+from .rate_limiter import RateLimiter
+
+class BulkIngestor:
+    """Pre-warms the documentation store from a JSONL file of historical queries"""
+    def __init__(self, orchestrator, workers: int = 4, batch_size: int = 20,
+                 implement: bool = False, checkpoint_path: Optional[str] = None,
+                 rate_limits: Optional[Dict[str, float]] = None):
+        self.orchestrator = orchestrator
+        self.research_agent = orchestrator.research_agent
+        self.coding_agent = orchestrator.coding_agent
+        self.config = {
+            'workers': workers,
+            'batch_size': batch_size,
+            'implement': implement,
+            'max_in_flight': workers * 2
+        }
+        self.checkpoint_path = checkpoint_path
+        rate_limits = {'tavily': 60, 'deepseek': 60, **(rate_limits or {})}
+        self.rate_limiters = {
+            provider: RateLimiter(limit) for provider, limit in rate_limits.items()
+        }
+        self.pending = {'research': [], 'implementation': [], 'keys': []}
+        self.stats = {'completed': 0, 'skipped': 0, 'failed': 0}
+
+    def run(self, input_path: str) -> Dict[str, int]:
+        """Ingest every query not already recorded in the checkpoint"""
+        completed = self._load_checkpoint()
+        in_flight = set()
+
+        with ThreadPoolExecutor(max_workers=self.config['workers']) as executor:
+            for key, query in self._iter_queries(input_path):
+                if key in completed:
+                    self.stats['skipped'] += 1
+                    continue
+                completed.add(key)
+
+                # Bound in-flight jobs so large files are never fully materialized
+                if len(in_flight) >= self.config['max_in_flight']:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    self._collect(done)
+
+                in_flight.add(executor.submit(self._process_query, key, query))
+
+            done, _ = wait(in_flight)
+            self._collect(done)
+
+        self._flush()
+        return self.stats
+
+    def _process_query(self, key: str, query: str) -> Tuple[str, Dict[str, Any], Optional[Dict[str, Any]]]:
+        """Run research (and optionally implementation) for one query on a worker thread"""
+        return asyncio.run(self._process_query_async(key, query))
+
+    async def _process_query_async(self, key: str, query: str):
+        complexity = self.orchestrator._assess_request_complexity(query)
+        tier_config = self.orchestrator.router.route(complexity)
+
+        self.rate_limiters['tavily'].acquire()
+        self.rate_limiters['deepseek'].acquire()
+        findings = await self.research_agent.research(query, search_config=tier_config, store=False)
+
+        implementation = None
+        if self.config['implement']:
+            self.rate_limiters['deepseek'].acquire()
+            implementation = await self.coding_agent.implement(findings, query, tier_config=tier_config)
+
+        return key, findings, implementation
+
+    def _collect(self, futures) -> None:
+        for future in futures:
+            try:
+                key, findings, implementation = future.result()
+            except Exception as e:
+                # Failed queries are left out of the checkpoint so a resumed run retries them
+                self.stats['failed'] += 1
+                print(f"Ingest failed: {e}")
+                continue
+
+            # Findings served from existing documentation don't need storing again
+            if findings.get("source") != "documentation":
+                self.pending['research'].append(self.research_agent.build_documentation_entry(findings))
+            if implementation:
+                self.pending['implementation'].append(self._build_implementation_entry(findings, implementation))
+            self.pending['keys'].append(key)
+            self.stats['completed'] += 1
+
+            if len(self.pending['keys']) >= self.config['batch_size']:
+                self._flush()
+
+    def _flush(self) -> None:
+        """Write pending results in batches, then checkpoint their queries"""
+        if not self.pending['keys']:
+            return
+
+        if self.pending['research'] and hasattr(self.research_agent, 'docs'):
+            asyncio.run(self.research_agent.docs.store_documentation_batch(self.pending['research']))
+        if self.pending['implementation']:
+            asyncio.run(self.orchestrator.documentation.store_documentation_batch(self.pending['implementation']))
+
+        self._append_checkpoint(self.pending['keys'])
+        self.pending = {'research': [], 'implementation': [], 'keys': []}
+
+    def _build_implementation_entry(self, findings: Dict[str, Any], implementation: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape implementations like the responses process_request serves from documentation"""
+        return {
+            "doc_type": "implementation",
+            "content": {
+                "explanation": implementation.get("explanation", ""),
+                "code": implementation.get("code", ""),
+                "research_summary": findings.get("summary", "")
+            },
+            "metadata": {
+                "query": findings["query"],
+                "timestamp": str(datetime.now()),
+                "source": "ingest"
+            }
+        }
+
+    def _iter_queries(self, input_path: str) -> Iterator[Tuple[str, str]]:
+        """Yield (key, query) pairs; lines may be JSON strings or objects with query/request"""
+        with open(input_path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                query = record if isinstance(record, str) else record.get("query") or record.get("request")
+                if query:
+                    yield hashlib.sha1(query.strip().lower().encode()).hexdigest(), query
+
+    def _load_checkpoint(self) -> set:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return set()
+        with open(self.checkpoint_path) as f:
+            return {line.strip() for line in f if line.strip()}
+
+    def _append_checkpoint(self, keys: List[str]) -> None:
+        if not self.checkpoint_path:
+            return
+        with open(self.checkpoint_path, "a") as f:
+            f.write("".join(f"{key}\n" for key in keys))
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-warm the documentation store from historical queries")
+    parser.add_argument("input", help="JSONL file of queries")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--implement", action="store_true", help="Also run the coding agent")
+    parser.add_argument("--checkpoint", default=None, help="Progress file for resuming (default: <input>.checkpoint)")
+    parser.add_argument("--tavily-rpm", type=float, default=60)
+    parser.add_argument("--deepseek-rpm", type=float, default=60)
+    args = parser.parse_args()
+
+    ingestor = BulkIngestor(
+        EnhancedOrchestratorAgent(),
+        workers=args.workers,
+        batch_size=args.batch_size,
+        implement=args.implement,
+        checkpoint_path=args.checkpoint or f"{args.input}.checkpoint",
+        rate_limits={'tavily': args.tavily_rpm, 'deepseek': args.deepseek_rpm}
+    )
+    print(json.dumps(ingestor.run(args.input)))
+
+if __name__ == "__main__":
+    main()
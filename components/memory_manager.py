@@ -2,17 +2,36 @@ from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
 import json
 from collections import defaultdict
+import itertools
 from letta.schemas.block import Block
+from .tiered_storage import TieredMemoryStore
+from .access_log import AccessLog
+from .snippet_store import SnippetStore
 
 class MemoryOptimizer:
-    def __init__(self, client, agent_id: str):
+    def __init__(self, client, agent_id: str, tiered_store: Optional[TieredMemoryStore] = None,
+                 access_log: Optional[AccessLog] = None, snippet_store: Optional[SnippetStore] = None,
+                 documentation_stores: Optional[List[Any]] = None):
         self.client = client
         self.agent_id = agent_id
+        self.tiered_store = tiered_store
+        self.access_log = access_log
+        self.snippet_store = snippet_store
+        self.documentation_stores = documentation_stores or []
         self.optimization_config = {
             'cleanup_threshold_days': 90,
             'consolidation_similarity_threshold': 0.8,
             'max_versions_to_keep': 3,
-            'memory_refresh_interval_days': 30
+            'memory_refresh_interval_days': 30,
+            'snippet_gc_grace_seconds': 3600,
+            'page_size': 100,
+            'importance_threshold': 0.7,
+            'removal_threshold': 0.2,
+            'importance_weights': {
+                'access_frequency': 0.5,
+                'success_rate': 0.2,
+                'relevance_score': 0.3
+            }
         }
 
     async def optimize_memory(self) -> None:
@@ -21,6 +40,7 @@ class MemoryOptimizer:
         await self.cleanup_old_memories()
         await self.optimize_memory_structure()
         await self.update_memory_indices()
+        await self.collect_unreferenced_snippets()
 
     async def consolidate_similar_memories(self) -> None:
         """Consolidate similar memories to reduce redundancy"""
@@ -39,7 +59,7 @@ class MemoryOptimizer:
                 await self._update_memory(key, merged)
 
     async def cleanup_old_memories(self) -> None:
-        """Remove outdated memories while preserving important ones"""
+        """Archive outdated memories, deleting only those that are clearly unused"""
         memories = await self._get_all_memories()
         current_time = datetime.now()
         
@@ -47,32 +67,129 @@ class MemoryOptimizer:
             age = (current_time - datetime.fromisoformat(memory['timestamp'])).days
             
             if age > self.optimization_config['cleanup_threshold_days']:
-                if not self._is_memory_important(memory):
+                if self._is_memory_removable(memory):
                     await self._remove_memory(memory['id'])
                 else:
-                    await self._archive_memory(memory)
+                    # Important memories stay readily available in the warm tier
+                    await self._archive_memory(
+                        memory, tier='warm' if self._is_memory_important(memory) else 'cold'
+                    )
 
     async def optimize_memory_structure(self) -> None:
         """Optimize memory storage structure"""
-        # Implement memory structure optimization
-        pass
+        # Demote idle archived memories from the warm to the cold tier
+        if self.tiered_store:
+            self.tiered_store.rebalance()
 
     async def update_memory_indices(self) -> None:
         """Update memory search indices"""
         # Implement memory index updating
         pass
 
+    async def collect_unreferenced_snippets(self) -> int:
+        """Mark snippets referenced by live or archived documentation, then sweep the rest"""
+        if not self.snippet_store:
+            return 0
+
+        referenced = set()
+        for docs in self.documentation_stores:
+            # Snapshot documents are served alongside live ones, so their snippets stay
+            for doc in itertools.chain(docs.iter_snapshot_documentation(), docs.iter_documentation()):
+                referenced.update(doc.get('content', {}).get('result_refs', []))
+        if self.tiered_store:
+            for doc in self.tiered_store.iter_entries():
+                referenced.update(doc.get('content', {}).get('result_refs', []))
+
+        return self.snippet_store.delete_unreferenced(
+            referenced,
+            grace_seconds=self.optimization_config['snippet_gc_grace_seconds']
+        )
+
+    async def _get_all_memories(self) -> List[Dict[str, Any]]:
+        """Decode documentation entries from the agent's archival memory, page by page"""
+        memories = []
+        page_size = self.optimization_config['page_size']
+        cursor = None
+        
+        while True:
+            page = self.client.get_archival_memory(self.agent_id, after=cursor, limit=page_size)
+            for memory in page or []:
+                if not memory.text.startswith("DOCUMENTATION_"):
+                    continue
+                try:
+                    doc_data = json.loads(memory.text.split(": ", 1)[1])
+                    memories.append({
+                        **doc_data,
+                        'id': memory.id,
+                        'timestamp': doc_data['metadata']['timestamp']
+                    })
+                except (json.JSONDecodeError, IndexError, KeyError):
+                    continue
+            if not page or len(page) < page_size:
+                return memories
+            cursor = page[-1].id
+
     def _is_memory_important(self, memory: Dict[str, Any]) -> bool:
         """Determine if a memory is important enough to keep"""
+        return self._calculate_importance_score(memory) > self.optimization_config['importance_threshold']
+
+    def _is_memory_removable(self, memory: Dict[str, Any]) -> bool:
+        """Only delete memories with access data showing they are unused; archive the rest"""
+        return bool(self.access_log and
+                    self._calculate_importance_score(memory) < self.optimization_config['removal_threshold'])
+
+    def _calculate_importance_score(self, memory: Dict[str, Any]) -> float:
+        """Weighted access frequency, success rate and relevance"""
         importance_factors = {
             'access_frequency': self._get_access_frequency(memory),
-            'success_rate': self._get_success_rate(memory),
             'relevance_score': self._calculate_relevance_score(memory)
         }
         
-        # Calculate weighted importance score
-        weights = {'access_frequency': 0.4, 'success_rate': 0.3, 'relevance_score': 0.3}
-        importance_score = sum(score * weights[factor] 
-                             for factor, score in importance_factors.items())
+        # Documents served without ever being accepted have no success signal;
+        # counting them as failures would penalize the most used documents
+        if self._has_acceptance_signal(memory):
+            importance_factors['success_rate'] = self._get_success_rate(memory)
         
-        return importance_score > 0.7
\ No newline at end of file
+        # Calculate weighted importance score over the available factors
+        weights = self.optimization_config['importance_weights']
+        total_weight = sum(weights[factor] for factor in importance_factors)
+        return sum(score * weights[factor]
+                   for factor, score in importance_factors.items()) / total_weight
+
+    def _has_acceptance_signal(self, memory: Dict[str, Any]) -> bool:
+        """Whether any serve of this memory was ever recorded as accepted"""
+        return bool(self.access_log and self.access_log.get_stats(memory['id'])['accepted'])
+
+    def _get_access_frequency(self, memory: Dict[str, Any]) -> float:
+        """Decayed access frequency from the access log"""
+        if not self.access_log:
+            return 0.0
+        return self.access_log.get_frequency(memory['id'])
+
+    def _get_success_rate(self, memory: Dict[str, Any]) -> float:
+        """Accepted/served ratio from the access log"""
+        if not self.access_log:
+            return 0.5
+        return self.access_log.get_success_rate(memory['id'])
+
+    def _calculate_relevance_score(self, memory: Dict[str, Any]) -> float:
+        """Relevance decays linearly with days since last access (or creation)"""
+        last_access = self.access_log.get_last_access(memory['id']) if self.access_log else None
+        last_seen = (datetime.fromtimestamp(last_access) if last_access
+                     else datetime.fromisoformat(memory['timestamp']))
+        days_idle = (datetime.now() - last_seen).days
+        return max(0.0, 1 - days_idle / self.optimization_config['cleanup_threshold_days'])
+
+    async def _archive_memory(self, memory: Dict[str, Any], tier: str = 'cold') -> None:
+        """Move an old memory out of archival memory into the tiered store"""
+        if not self.tiered_store:
+            return
+
+        self.tiered_store.put(memory['id'], memory, tier=tier)
+        await self._remove_memory(memory['id'])
+
+    async def _remove_memory(self, memory_id: str) -> None:
+        """Delete a memory from the agent's archival memory and any loaded snapshot"""
+        self.client.delete_archival_memory(self.agent_id, memory_id)
+        for docs in self.documentation_stores:
+            docs.discard(memory_id)
\ No newline at end of file
@@ -1,6 +1,10 @@
 import os
 import json
+import time
 import uuid
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Any, Optional
 from letta.schemas.block import Block
@@ -8,6 +12,11 @@ from letta.schemas.memory import ChatMemory
 from .agents import ResearchAgent, CodingAgent
 from .documentation import EnhancedDocumentation
 from .memory_manager import MemoryOptimizer
+from .routing import ComplexityRouter
+from .context_manager import ContextManager
+from .tiered_storage import TieredMemoryStore
+from .access_log import AccessLog
+from .snippet_store import SnippetStore
 
 class EnhancedOrchestratorAgent:
     """Advanced orchestrator with sophisticated agent coordination"""
@@ -35,13 +44,58 @@ class EnhancedOrchestratorAgent:
             persona=self._get_orchestrator_persona()
         )
         
+        # Bound per-agent conversation history so latency stays flat over uptime
+        self.context_manager = ContextManager(
+            self.client,
+            mode=os.getenv("CONTEXT_MODE", "rolling"),
+            max_context_tokens=int(os.getenv("CONTEXT_MAX_TOKENS", "8000"))
+        )
+        
+        # Track document hits/serves/acceptance for importance scoring and eviction
+        self.store_dir = os.getenv("MEMORY_STORE_DIR", ".memory_store")
+        os.makedirs(self.store_dir, exist_ok=True)
+        self.access_log = AccessLog(os.path.join(self.store_dir, "access_log.bin"))
+        
+        # Search result snippets are stored once and referenced by documentation
+        self.snippet_store = SnippetStore(os.path.join(self.store_dir, "snippets.db"))
+        
         # Initialize agents with shared context
         self.research_agent = self._create_research_agent()
         self.coding_agent = self._create_coding_agent()
         
+        self.tiered_store = TieredMemoryStore(self.store_dir, access_log=self.access_log)
+        
+        # Serve searches from a prebuilt snapshot when one is available
+        self.documentation = EnhancedDocumentation(
+            self.client,
+            self.org_block.id,
+            tiered_store=self.tiered_store,
+            snapshot_path=self._get_snapshot_path("DOC_SNAPSHOT_PATH"),
+            snippet_store=self.snippet_store
+        )
+        
         # Initialize memory optimization
-        self.memory_optimizer = MemoryOptimizer(self.client, self.org_block.id)
-        self.documentation = EnhancedDocumentation(self.client, self.org_block.id)
+        self.memory_optimizer = MemoryOptimizer(
+            self.client,
+            self.org_block.id,
+            tiered_store=self.tiered_store,
+            access_log=self.access_log,
+            snippet_store=self.snippet_store,
+            documentation_stores=[self.documentation] + (
+                [self.research_agent.docs] if hasattr(self.research_agent, 'docs') else []
+            )
+        )
+        
+        # Route requests to tiered model/research settings by complexity
+        self.router = ComplexityRouter()
+        
+        # Daily optimization runs on its own thread, off the request path; the
+        # last run time is persisted so restarts don't trigger a fresh run
+        self.optimization_state_path = os.path.join(self.store_dir, "last_optimization")
+        self.optimization_executor = ThreadPoolExecutor(max_workers=1)
+        self.optimization_lock = threading.Lock()
+        self.optimizing = False
+        self._load_optimization_state()
 
     def _get_orchestrator_persona(self) -> str:
         return """You are an advanced orchestrator agent responsible for:
@@ -59,16 +113,27 @@ class EnhancedOrchestratorAgent:
             enhanced_features={
                 "memory_optimization": True,
                 "documentation_storage": True,
-                "rag_enabled": True
-            }
+                "rag_enabled": True,
+                "query_decomposition": os.getenv("QUERY_DECOMPOSITION", "true").lower() == "true"
+            },
+            context_manager=self.context_manager,
+            access_log=self.access_log,
+            snippet_store=self.snippet_store,
+            snapshot_path=self._get_snapshot_path("RESEARCH_SNAPSHOT_PATH")
         )
 
+    def _get_snapshot_path(self, env_var: str) -> Optional[str]:
+        """Snapshot file named by an environment variable, if it exists"""
+        snapshot_path = os.getenv(env_var)
+        return snapshot_path if snapshot_path and os.path.exists(snapshot_path) else None
+
     def _create_coding_agent(self) -> CodingAgent:
         """Create coding agent with shared context"""
         return CodingAgent(
             self.client,
             self.org_block,
-            model_config=self._get_deepseek_config()
+            model_config=self._get_deepseek_config(),
+            context_manager=self.context_manager
         )
 
     def _get_deepseek_config(self) -> Dict[str, Any]:
@@ -87,28 +152,46 @@ class EnhancedOrchestratorAgent:
             }
         }
 
-    async def process_request(self, request: str) -> Dict[str, Any]:
-        """Process user request with enhanced orchestration"""
+    async def process_request(self, request: str, priority: str = "normal",
+                              documentation_only: bool = False) -> Dict[str, Any]:
+        """Process user request with enhanced orchestration
+
+        With ``documentation_only`` (used for load shedding) only stored
+        documentation is served and no research or implementation runs.
+        """
+        # Optimize memory periodically in the background, never while shedding load
+        if not documentation_only:
+            self._schedule_optimization()
+
+        complexity = self._assess_request_complexity(request)
+
         # Check documentation first
         existing_docs = await self.documentation.search_documentation(
             query=request,
-            filters={"complexity": self._assess_request_complexity(request)}
+            filters={"complexity": complexity},
+            limit=1
         )
 
         if existing_docs:
             print("Found existing documentation")
+            self.access_log.record(existing_docs[0].get("id"), "hit")
+            self.access_log.record(existing_docs[0].get("id"), "served")
             return self._prepare_documented_response(existing_docs[0])
 
+        if documentation_only:
+            return self._prepare_degraded_response(request)
+
         # If no documentation exists, proceed with research and implementation
-        workflow = await self._create_workflow(request)
+        workflow = await self._create_workflow(request, priority)
+        start_time = time.perf_counter()
         response = await self._execute_workflow(workflow)
+        self.router.record_latency(
+            workflow["metadata"]["tier"]["tier"],
+            time.perf_counter() - start_time
+        )
         
         # Store new documentation
         await self._store_workflow_results(workflow, response)
-        
-        # Optimize memory periodically
-        if self.should_optimize():
-            await self._optimize_system()
             
         return response
 
@@ -125,17 +208,52 @@ class EnhancedOrchestratorAgent:
         last_opt_time = datetime.fromisoformat(last_optimization)
         return (datetime.now() - last_opt_time).days >= 1
 
+    def _schedule_optimization(self) -> None:
+        """Start a background optimization run if one is due and none is running"""
+        with self.optimization_lock:
+            if self.optimizing or not self.should_optimize():
+                return
+            self.optimizing = True
+        self.optimization_executor.submit(self._run_optimization)
+
+    def _run_optimization(self) -> None:
+        try:
+            asyncio.run(self._optimize_system())
+        except Exception as e:
+            print(f"System optimization failed: {e}")
+        finally:
+            with self.optimization_lock:
+                self.optimizing = False
+
+    def _load_optimization_state(self) -> None:
+        """Restore the last optimization time saved by a previous process"""
+        try:
+            with open(self.optimization_state_path) as f:
+                last_optimization = f.read().strip()
+            datetime.fromisoformat(last_optimization)
+        except (OSError, ValueError):
+            return
+        self._set_last_optimization(last_optimization)
+
+    def _set_last_optimization(self, last_optimization: str) -> None:
+        context = json.loads(self.org_block.value)
+        context.setdefault("system_context", {})["last_optimization"] = last_optimization
+        self.org_block.value = json.dumps(context)
+
     async def _optimize_system(self) -> None:
         """Perform system-wide optimization"""
         # Update context with optimization time
-        context = json.loads(self.org_block.value)
-        context["system_context"]["last_optimization"] = str(datetime.now())
-        self.org_block.value = json.dumps(context)
+        last_optimization = str(datetime.now())
+        self._set_last_optimization(last_optimization)
+        with open(self.optimization_state_path, "w") as f:
+            f.write(last_optimization)
         
-        # Run memory optimization
-        self.memory_optimizer.consolidate_memory()
-        await self._cleanup_old_workflows()
-        await self._update_metrics()
+        # Archive or remove old memories, then demote idle archived entries
+        await self.memory_optimizer.cleanup_old_memories()
+        await self.memory_optimizer.optimize_memory_structure()
+        
+        # Sweep search result snippets no live or archived documentation references
+        await self.memory_optimizer.collect_unreferenced_snippets()
 
     def _assess_request_complexity(self, request: str) -> str:
         """Assess the complexity of the request"""
@@ -161,8 +279,18 @@ class EnhancedOrchestratorAgent:
             "doc_id": doc.get("id")
         }
 
-    async def _create_workflow(self, request: str) -> Dict[str, Any]:
+    def _prepare_degraded_response(self, request: str) -> Dict[str, Any]:
+        """Prepare response when only documentation may be served and none matched"""
+        return {
+            "explanation": "The system is under heavy load and no stored documentation matches this request yet. Please retry shortly.",
+            "code": "",
+            "research_summary": "",
+            "source": "degraded"
+        }
+
+    async def _create_workflow(self, request: str, priority: str = "normal") -> Dict[str, Any]:
         """Create execution workflow"""
+        complexity = self._assess_request_complexity(request)
         return {
             "id": str(uuid.uuid4()),
             "request": request,
@@ -180,33 +308,59 @@ class EnhancedOrchestratorAgent:
                 }
             ],
             "metadata": {
-                "complexity": self._assess_request_complexity(request),
-                "priority": "normal"
+                "complexity": complexity,
+                "tier": self.router.route(complexity),
+                "priority": priority
             }
         }
 
     async def _execute_workflow(self, workflow: Dict[str, Any]) -> Dict[str, Any]:
         """Execute workflow steps"""
         results = {}
+        tier_config = workflow["metadata"]["tier"]
         
-        # Execute research
-        workflow["steps"][0]["status"] = "in_progress"
-        research_results = await self.research_agent.research(workflow["request"])
+        # Execute research unless the routed tier skips it
+        if tier_config["research_enabled"]:
+            workflow["steps"][0]["status"] = "in_progress"
+            research_results = await self.research_agent.research(
+                workflow["request"],
+                search_config=tier_config
+            )
+            workflow["steps"][0]["status"] = "completed"
+        else:
+            research_results = self._get_skipped_research(workflow["request"])
+            workflow["steps"][0]["status"] = "skipped"
         results["research"] = research_results
-        workflow["steps"][0]["status"] = "completed"
         
         # Execute implementation
         if research_results:
             workflow["steps"][1]["status"] = "in_progress"
             implementation = await self.coding_agent.implement(
                 research_results,
-                workflow["request"]
+                workflow["request"],
+                tier_config=tier_config
             )
             results["implementation"] = implementation
             workflow["steps"][1]["status"] = "completed"
+            
+            # Documented findings that yielded code count as accepted
+            if research_results.get("source") == "documentation" and implementation.get("code"):
+                self.access_log.record(research_results.get("doc_id"), "accepted")
         
         return self._prepare_response(results, workflow)
 
+    def _get_skipped_research(self, request: str) -> Dict[str, Any]:
+        """Placeholder findings for tiers that answer without research"""
+        return {
+            "query": request,
+            "timestamp": str(datetime.now()),
+            "results": [],
+            "summary": "",
+            "source": "skipped",
+            "categories": [],
+            "best_practices": []
+        }
+
     def _prepare_response(self, results: Dict[str, Any], workflow: Dict[str, Any]) -> Dict[str, Any]:
         """Prepare final response"""
         return {
@@ -0,0 +1,95 @@
+from typing import List, Set
+import re
+
+# Separators between the parts of a multi-part request
+PART_SEPARATORS = r",|;|\band\b|\bwith\b|\bplus\b|\bas well as\b"
+
+# A clause opening with a request verb or question word reads as a request of its own
+REQUEST_VERBS = {
+    'add', 'build', 'compare', 'configure', 'create', 'debug', 'deploy', 'describe', 'design',
+    'develop', 'explain', 'fix', 'generate', 'implement', 'integrate', 'make', 'optimize',
+    'refactor', 'set', 'setup', 'test', 'write'
+}
+QUESTION_WORDS = {'how', 'what', 'why', 'when', 'which', 'where', 'can', 'should', 'is', 'are', 'does', 'do'}
+REQUEST_STARTERS = REQUEST_VERBS | QUESTION_WORDS
+
+# Pronouns that lean on an earlier part for their subject
+BACK_REFERENCES = {'it', 'its', 'them', 'this', 'that', 'these', 'those'}
+
+# Components and services a request can combine. Frameworks and languages
+# ("with Flask", "in Python") are context for a request, not topics of their own.
+TOPIC_PATTERNS = {
+    'auth': r"\bauth", 'jwt': r"\bjwt", 'oauth': r"\boauth", 'session': r"\bsessions?\b",
+    'cache': r"\bcach", 'redis': r"\bredis", 'memcached': r"\bmemcached",
+    'rate_limit': r"\brate[- ]?limit", 'postgres': r"\bpostgres", 'mysql': r"\bmysql",
+    'mongodb': r"\bmongo", 'sqlite': r"\bsqlite", 'database': r"\bdatabase",
+    'connection_pool': r"\bconnection pool", 'queue': r"\bqueue", 'kafka': r"\bkafka",
+    'rabbitmq': r"\brabbitmq", 'celery': r"\bcelery", 'websocket': r"\bwebsocket",
+    'graphql': r"\bgraphql", 'logging': r"\blogging", 'monitoring': r"\bmonitoring",
+    'pagination': r"\bpaginat", 'elasticsearch': r"\belasticsearch", 'docker': r"\bdocker",
+    'kubernetes': r"\bkubernetes|\bk8s\b", 'encryption': r"\bencrypt", 'csrf': r"\bcsrf",
+    'cors': r"\bcors\b", 'validation': r"\bvalidat", 'upload': r"\bupload", 'email': r"\bemail",
+    'notification': r"\bnotification"
+}
+
+
+def decompose_query(query: str, max_sub_queries: int = 4, min_part_words: int = 2) -> List[str]:
+    """Split a multi-part request into sub-queries that each stand on their own
+
+    A part stands alone if it is a clause opening with a request verb or
+    question word, or a noun phrase naming only topics no earlier part covers.
+    Noun phrases inherit the request verb of the first part. If any part
+    fails, the query is kept whole.
+
+    >>> decompose_query("JWT auth with Redis session cache and rate limiting")
+    ['JWT auth', 'Redis session cache', 'rate limiting']
+    >>> decompose_query("Implement JWT auth and Redis session cache and rate limiting")
+    ['Implement JWT auth', 'Implement Redis session cache', 'Implement rate limiting']
+    >>> decompose_query("Implement JWT auth, add rate limiting and write tests")
+    ['Implement JWT auth', 'add rate limiting', 'write tests']
+    >>> decompose_query("Create a REST API with Flask")
+    ['Create a REST API with Flask']
+    >>> decompose_query("What is the difference between lists and tuples in Python?")
+    ['What is the difference between lists and tuples in Python?']
+    >>> decompose_query("How do I iterate over key, value pairs in a dictionary?")
+    ['How do I iterate over key, value pairs in a dictionary?']
+    >>> decompose_query("Build a Redis cache and then deploy it to Kubernetes")
+    ['Build a Redis cache and then deploy it to Kubernetes']
+    >>> decompose_query("Implement caching with a Redis cache")
+    ['Implement caching with a Redis cache']
+    """
+    parts = [re.sub(r"^(?:also|then)\s+", "", part.strip(), flags=re.IGNORECASE)
+             for part in re.split(PART_SEPARATORS, query, flags=re.IGNORECASE)]
+    parts = [part for part in parts if part]
+    if len(parts) < 2:
+        return [query]
+
+    first_word = parts[0].split()[0]
+    verb = first_word if first_word.lower() in REQUEST_VERBS else None
+    sub_queries = []
+    seen_topics = set()
+
+    for part in parts:
+        words = [word.lower() for word in part.split()]
+        if len(words) < min_part_words or BACK_REFERENCES.intersection(words):
+            return [query]
+
+        topics = _find_topics(part)
+        if words[0] not in REQUEST_STARTERS:
+            if not topics or topics & seen_topics:
+                return [query]
+            if verb:
+                part = f"{verb} {part}"
+        seen_topics |= topics
+
+        if part not in sub_queries:
+            sub_queries.append(part)
+
+    if len(sub_queries) < 2:
+        return [query]
+    return sub_queries[:max_sub_queries]
+
+
+def _find_topics(text: str) -> Set[str]:
+    return {topic for topic, pattern in TOPIC_PATTERNS.items()
+            if re.search(pattern, text, flags=re.IGNORECASE)}
@@ -0,0 +1,17 @@
+import threading
+import time
+
+class RateLimiter:
+    """Thread-safe limiter spacing calls evenly to a requests-per-minute budget"""
+    def __init__(self, requests_per_minute: float):
+        self.interval = 60.0 / requests_per_minute
+        self.lock = threading.Lock()
+        self.next_slot = time.monotonic()
+
+    def acquire(self) -> None:
+        with self.lock:
+            now = time.monotonic()
+            wait_time = self.next_slot - now
+            self.next_slot = max(now, self.next_slot) + self.interval
+        if wait_time > 0:
+            time.sleep(wait_time)
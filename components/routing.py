@@ -0,0 +1,67 @@
+from typing import Dict, Any, Optional
+from collections import defaultdict
+import copy
+
+class ComplexityRouter:
+    """Maps assessed request complexity to tiered model and research settings"""
+    def __init__(self, tiers: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.tiers = tiers or self._get_default_tiers()
+        self.default_tier = 'medium'
+        self.max_latency_samples = 1000
+        self.latency_metrics = defaultdict(list)
+
+    def _get_default_tiers(self) -> Dict[str, Dict[str, Any]]:
+        """Default tier mapping; the high tier matches the original full pipeline"""
+        return {
+            'low': {
+                'model_name': 'deepseek-chat',
+                'max_tokens': 1024,
+                'search_depth': 'basic',
+                'max_results': 3,
+                'research_enabled': False
+            },
+            'medium': {
+                'model_name': 'deepseek-v2.5',
+                'max_tokens': 2048,
+                'search_depth': 'basic',
+                'max_results': 5,
+                'research_enabled': True
+            },
+            'high': {
+                'model_name': 'deepseek-v2.5',
+                'max_tokens': 4096,
+                'search_depth': 'advanced',
+                'max_results': 10,
+                'research_enabled': True
+            }
+        }
+
+    def route(self, complexity: str) -> Dict[str, Any]:
+        """Get tier configuration for the given complexity level"""
+        tier = complexity if complexity in self.tiers else self.default_tier
+        return {"tier": tier, **copy.deepcopy(self.tiers[tier])}
+
+    def record_latency(self, tier: str, latency: float) -> None:
+        """Record end-to-end latency for a request served by a tier"""
+        samples = self.latency_metrics[tier]
+        samples.append(latency)
+
+        # Keep only the most recent measurements per tier
+        if len(samples) > self.max_latency_samples:
+            self.latency_metrics[tier] = samples[-self.max_latency_samples:]
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """Summarize recorded latency per tier for tuning the mapping"""
+        stats = {}
+        for tier, samples in self.latency_metrics.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            stats[tier] = {
+                'count': len(ordered),
+                'average': sum(ordered) / len(ordered),
+                'p50': ordered[len(ordered) // 2],
+                'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+                'max': ordered[-1]
+            }
+        return stats
@@ -0,0 +1,145 @@
+from typing import Dict, Any, List, Optional, Iterable, Iterator, NamedTuple, Callable
+from datetime import datetime
+import json
+import mmap
+import os
+import struct
+import time
+
+class SnapshotEntry(NamedTuple):
+    ordinal: int
+    timestamp: float
+    category: str
+    complexity: str
+    memory_id: Optional[str]
+
+class DocumentSnapshot:
+    """Memory-mapped snapshot of decoded documentation and its search fields
+
+    Layout: a fixed header, offset-addressed content (each document's JSON
+    followed by its lowercased JSON used for keyword matching), one fixed-size
+    record per document and a JSON string table (categories, complexities and
+    source memory ids). Documents are only decoded when returned, so a new
+    worker can search as soon as the file is mapped.
+    """
+    MAGIC = b"LDSNAP01"
+    # magic, created_at, count, records offset, strings offset, strings length
+    HEADER = struct.Struct("<8sdQQQQ")
+    # raw offset, raw length, lowercase offset, lowercase length, timestamp, category idx, complexity idx
+    RECORD = struct.Struct("<QIQIdII")
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.created_at, self.count, self._records_offset, strings_offset, strings_length = \
+            self.HEADER.unpack_from(self._mm, 0)
+        if magic != self.MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a documentation snapshot")
+
+        strings = json.loads(self._mm[strings_offset:strings_offset + strings_length])
+        self.last_memory_id = strings["last_memory_id"]
+        self.categories = strings["categories"]
+        self.complexities = strings["complexities"]
+        # Snapshots written before ids were recorded have to be decoded to find them
+        self.memory_ids = strings.get("memory_ids") or [None] * self.count
+
+    @classmethod
+    def write(cls, path: str, docs: Iterable[Dict[str, Any]],
+              get_last_memory_id: Callable[[], Optional[str]]) -> int:
+        """Write documents to a new snapshot file, returning the document count
+
+        ``get_last_memory_id`` is called once ``docs`` is exhausted, so a
+        streaming export can report the last archival memory id it read.
+        """
+        records = []
+        memory_ids = []
+        categories, complexities = {}, {}
+        tmp_path = path + ".tmp"
+
+        with open(tmp_path, "wb") as f:
+            f.write(b"\0" * cls.HEADER.size)
+            for doc in docs:
+                raw = json.dumps(doc).encode()
+                lower = raw.lower()
+                metadata = doc.get("metadata", {})
+                category = str(metadata.get("category", ""))
+                complexity = str(metadata.get("complexity", ""))
+                memory_ids.append(doc.get("id"))
+
+                raw_offset = f.tell()
+                f.write(raw)
+                lower_offset = f.tell()
+                f.write(lower)
+                records.append((
+                    raw_offset, len(raw), lower_offset, len(lower),
+                    cls._to_epoch(metadata.get("timestamp")),
+                    categories.setdefault(category, len(categories)),
+                    complexities.setdefault(complexity, len(complexities))
+                ))
+
+            records_offset = f.tell()
+            for record in records:
+                f.write(cls.RECORD.pack(*record))
+
+            strings = json.dumps({
+                "last_memory_id": get_last_memory_id(),
+                "categories": list(categories),
+                "complexities": list(complexities),
+                "memory_ids": memory_ids
+            }).encode()
+            strings_offset = f.tell()
+            f.write(strings)
+
+            f.seek(0)
+            f.write(cls.HEADER.pack(cls.MAGIC, time.time(), len(records),
+                                    records_offset, strings_offset, len(strings)))
+
+        os.replace(tmp_path, path)
+        return len(records)
+
+    def iter_entries(self) -> Iterator[SnapshotEntry]:
+        """Yield fixed-layout search fields for every document without decoding it"""
+        for ordinal in range(self.count):
+            _, _, _, _, timestamp, category_idx, complexity_idx = self._record(ordinal)
+            yield SnapshotEntry(ordinal, timestamp, self.categories[category_idx],
+                                self.complexities[complexity_idx], self.memory_ids[ordinal])
+
+    def iter_documents(self) -> Iterator[Dict[str, Any]]:
+        """Decode every document in order"""
+        for ordinal in range(self.count):
+            yield self.load(ordinal)
+
+    def get_memory_id(self, ordinal: int) -> Optional[str]:
+        """Archival memory id a document was exported from"""
+        memory_id = self.memory_ids[ordinal]
+        if memory_id is None:
+            memory_id = self.load(ordinal).get("id")
+        return memory_id
+
+    def count_terms(self, ordinal: int, terms: List[bytes]) -> int:
+        """Count query terms present in a document's lowercased JSON, searching the map in place"""
+        _, _, lower_offset, lower_length, _, _, _ = self._record(ordinal)
+        end = lower_offset + lower_length
+        return sum(self._mm.find(term, lower_offset, end) != -1 for term in terms)
+
+    def load(self, ordinal: int) -> Dict[str, Any]:
+        """Decode a single document"""
+        raw_offset, raw_length, _, _, _, _, _ = self._record(ordinal)
+        return json.loads(self._mm[raw_offset:raw_offset + raw_length])
+
+    def close(self) -> None:
+        self._mm.close()
+        self._file.close()
+
+    def _record(self, ordinal: int) -> tuple:
+        return self.RECORD.unpack_from(self._mm, self._records_offset + ordinal * self.RECORD.size)
+
+    @staticmethod
+    def _to_epoch(timestamp: Optional[str]) -> float:
+        try:
+            return datetime.fromisoformat(timestamp).timestamp()
+        except (TypeError, ValueError):
+            return 0.0
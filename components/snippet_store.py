@@ -0,0 +1,69 @@
+from typing import Any, Iterable, List, Set
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+class SnippetStore:
+    """Content-addressed table of search result snippets referenced by documentation"""
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS snippets ("
+                "id TEXT PRIMARY KEY, data TEXT NOT NULL, touched_at REAL NOT NULL)"
+            )
+
+    @staticmethod
+    def snippet_id(result: Any) -> str:
+        """Hash of URL and content (or the whole result if it isn't a dict)"""
+        if isinstance(result, dict):
+            key = f"{result.get('url', '')}\n{result.get('content', '')}"
+        else:
+            key = json.dumps(result, sort_keys=True, default=str)
+        return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+    def put_many(self, results: Iterable[Any]) -> List[str]:
+        """Store results once each, returning their ids in order"""
+        rows = [(self.snippet_id(result), json.dumps(result, default=str), time.time())
+                for result in results]
+        with self.lock, self.connection:
+            # Re-referenced snippets get a fresh touch so garbage collection spares them
+            self.connection.executemany(
+                "INSERT INTO snippets (id, data, touched_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET touched_at = excluded.touched_at",
+                rows
+            )
+        return [row[0] for row in rows]
+
+    def get_many(self, snippet_ids: List[str]) -> List[Any]:
+        """Resolve ids to results, preserving order and skipping missing entries"""
+        if not snippet_ids:
+            return []
+        unique_ids = list(dict.fromkeys(snippet_ids))
+        placeholders = ",".join("?" * len(unique_ids))
+        with self.lock:
+            rows = dict(self.connection.execute(
+                f"SELECT id, data FROM snippets WHERE id IN ({placeholders})",
+                unique_ids
+            ).fetchall())
+        return [json.loads(rows[snippet_id]) for snippet_id in snippet_ids if snippet_id in rows]
+
+    def delete_unreferenced(self, referenced: Set[str], grace_seconds: float = 3600) -> int:
+        """Delete snippets no document references, sparing recently written ones"""
+        cutoff = time.time() - grace_seconds
+        with self.lock:
+            candidates = [row[0] for row in self.connection.execute(
+                "SELECT id FROM snippets WHERE touched_at < ?", (cutoff,)
+            )]
+            unreferenced = [(snippet_id,) for snippet_id in candidates if snippet_id not in referenced]
+            with self.connection:
+                self.connection.executemany("DELETE FROM snippets WHERE id = ?", unreferenced)
+        return len(unreferenced)
+
+    def count(self) -> int:
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM snippets").fetchone()[0]
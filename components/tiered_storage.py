@@ -0,0 +1,274 @@
+from typing import Dict, Any, List, Optional, Callable, Iterator, Tuple
+from datetime import datetime, timedelta
+from collections import OrderedDict
+import gzip
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import threading
+from .access_log import AccessLog
+
+class TieredMemoryStore:
+    """Hot/warm/cold storage for archived memories
+
+    Every entry lives on disk, either as plain JSON in the warm tier or gzip
+    compressed in the cold tier. The hot tier is an in-process LRU cache of
+    decoded entries over the warm tier. The index keeps each entry's metadata
+    so searches can rule entries out without reading them.
+    """
+    def __init__(self, base_dir: str, hot_capacity: int = 256, warm_max_idle_days: int = 30,
+                 access_log: Optional[AccessLog] = None):
+        self.base_dir = base_dir
+        self.access_log = access_log
+        self.warm_dir = os.path.join(base_dir, "warm")
+        self.cold_dir = os.path.join(base_dir, "cold")
+        self.index_path = os.path.join(base_dir, "index.json")
+        self.config = {
+            'hot_capacity': hot_capacity,
+            'warm_max_idle_days': warm_max_idle_days,
+            'eviction_sample_size': 8
+        }
+
+        os.makedirs(self.warm_dir, exist_ok=True)
+        os.makedirs(self.cold_dir, exist_ok=True)
+
+        # Searches and background optimization touch the index from different threads
+        self.lock = threading.RLock()
+        self.hot = OrderedDict()
+        self.index = self._load_index()
+
+    def put(self, doc_id: str, doc: Dict[str, Any], tier: str = 'warm') -> None:
+        """Store an entry in the warm or cold tier"""
+        if tier not in ('warm', 'cold'):
+            raise ValueError(f"Unknown storage tier '{tier}'")
+
+        with self.lock:
+            self._discard_files(doc_id)
+            self._write(doc_id, doc, tier)
+            self.index[doc_id] = {
+                'tier': tier,
+                'stored_at': str(datetime.now()),
+                'last_access': str(datetime.now()),
+                'metadata': doc.get('metadata')
+            }
+            if tier == 'warm':
+                self._cache(doc_id, doc)
+            else:
+                self.hot.pop(doc_id, None)
+            self._save_index()
+
+    def get(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch an entry, promoting it towards the hot tier"""
+        with self.lock:
+            if doc_id not in self.index:
+                return None
+
+            doc = self.hot.get(doc_id)
+            if doc is None:
+                doc = self._read(doc_id, self.index[doc_id]['tier'])
+                if doc is None:
+                    return None
+            self.touch(doc_id, doc)
+            return doc
+
+    def touch(self, doc_id: str, doc: Optional[Dict[str, Any]] = None, save: bool = True) -> None:
+        """Record an access; cold entries are promoted back to the warm tier"""
+        with self.lock:
+            entry = self.index.get(doc_id)
+            if not entry:
+                return
+
+            if entry['tier'] == 'cold':
+                doc = doc or self._read(doc_id, 'cold')
+                if doc is None:
+                    return
+                self._discard_files(doc_id)
+                self._write(doc_id, doc, 'warm')
+                entry['tier'] = 'warm'
+
+            entry['last_access'] = str(datetime.now())
+            if doc is not None:
+                self._cache(doc_id, doc)
+            if save:
+                self._save_index()
+
+    def remove(self, doc_id: str) -> None:
+        """Delete an entry from every tier"""
+        with self.lock:
+            self.hot.pop(doc_id, None)
+            if self.index.pop(doc_id, None):
+                self._discard_files(doc_id)
+                self._save_index()
+
+    def rebalance(self) -> Dict[str, int]:
+        """Demote warm entries idle longer than the configured age to the cold tier"""
+        with self.lock:
+            cutoff = datetime.now() - timedelta(days=self.config['warm_max_idle_days'])
+            demoted = 0
+
+            for doc_id, entry in self.index.items():
+                if entry['tier'] != 'warm' or datetime.fromisoformat(entry['last_access']) >= cutoff:
+                    continue
+                doc = self.hot.pop(doc_id, None) or self._read(doc_id, 'warm')
+                if doc is None:
+                    continue
+                self._discard_files(doc_id)
+                self._write(doc_id, doc, 'cold')
+                entry['tier'] = 'cold'
+                demoted += 1
+
+            if demoted:
+                self._save_index()
+            return {'demoted': demoted, **self.get_tier_counts()}
+
+    def search(self, score_fn: Callable[[Dict[str, Any]], Optional[float]], limit: int,
+               min_score: Optional[float] = None,
+               bound_fn: Optional[Callable[[Dict[str, Any]], Optional[float]]] = None
+               ) -> List[Tuple[float, Dict[str, Any]]]:
+        """Score entries tier by tier, reading the cold tier only when needed
+
+        ``score_fn`` returns None for entries that should be skipped. The cold
+        tier is scanned only if the hot and warm tiers cannot supply ``limit``
+        entries meeting ``min_score``. ``bound_fn`` maps an entry's indexed
+        metadata to an upper bound on its score (None to skip it); entries
+        whose bound cannot beat the current results are never read.
+        """
+        with self.lock:
+            results = []
+            counter = itertools.count()
+            for tier in ('warm', 'cold'):
+                if tier == 'cold' and len(results) >= limit:
+                    break
+                self._search_tier(tier, score_fn, bound_fn, limit, min_score, results, counter)
+
+            ranked = sorted(results, reverse=True)
+            for score, _, doc_id, doc in ranked:
+                self.touch(doc_id, doc, save=False)
+            if ranked:
+                self._save_index()
+            return [(score, doc) for score, _, doc_id, doc in ranked]
+
+    def _search_tier(self, tier: str, score_fn: Callable[[Dict[str, Any]], Optional[float]],
+                     bound_fn: Optional[Callable[[Dict[str, Any]], Optional[float]]], limit: int,
+                     min_score: Optional[float], results: List[Tuple[float, int, str, Dict[str, Any]]],
+                     counter: Iterator[int]) -> None:
+        """Add a tier's best entries to the ``results`` min-heap, most promising first"""
+        candidates = []
+        for doc_id, entry in self.index.items():
+            if entry['tier'] != tier:
+                continue
+            # Entries indexed without metadata have to be read to be scored
+            bound = bound_fn(entry['metadata']) if bound_fn and entry.get('metadata') else float('inf')
+            if bound is not None:
+                candidates.append((bound, doc_id))
+        candidates.sort(key=lambda x: x[0], reverse=True)
+
+        for bound, doc_id in candidates:
+            if min_score is not None and bound < min_score:
+                break
+            if len(results) >= limit and bound <= results[0][0]:
+                break
+            doc = self.hot.get(doc_id) if tier == 'warm' else None
+            if doc is None:
+                doc = self._read(doc_id, tier)
+            if doc is None:
+                continue
+            score = score_fn(doc)
+            if score is None or (min_score is not None and score < min_score):
+                continue
+            # Ties keep the entry found first
+            item = (score, -next(counter), doc_id, doc)
+            if len(results) < limit:
+                heapq.heappush(results, item)
+            elif item[:2] > results[0][:2]:
+                heapq.heapreplace(results, item)
+
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        """Yield every stored entry without promoting it"""
+        for tier in ('warm', 'cold'):
+            for _, doc in self._iter_tier(tier):
+                yield doc
+
+    def get_tier_counts(self) -> Dict[str, int]:
+        """Count entries per tier"""
+        with self.lock:
+            counts = {'hot': len(self.hot), 'warm': 0, 'cold': 0}
+            for entry in self.index.values():
+                counts[entry['tier']] += 1
+            return counts
+
+    def _iter_tier(self, tier: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        with self.lock:
+            doc_ids = [doc_id for doc_id, entry in self.index.items() if entry['tier'] == tier]
+        for doc_id in doc_ids:
+            doc = self.hot.get(doc_id) if tier == 'warm' else None
+            if doc is None:
+                doc = self._read(doc_id, tier)
+            if doc is not None:
+                yield doc_id, doc
+
+    def _cache(self, doc_id: str, doc: Dict[str, Any]) -> None:
+        self.hot[doc_id] = doc
+        self.hot.move_to_end(doc_id)
+        while len(self.hot) > self.config['hot_capacity']:
+            self.hot.pop(self._select_eviction(exclude=doc_id))
+
+    def _select_eviction(self, exclude: str) -> str:
+        """Evict the least frequently accessed of the least recently used entries"""
+        if not self.access_log:
+            return next(iter(self.hot))
+
+        candidates = []
+        for doc_id in self.hot:
+            if doc_id == exclude:
+                continue
+            candidates.append(doc_id)
+            if len(candidates) >= self.config['eviction_sample_size']:
+                break
+        return min(candidates, key=self.access_log.get_frequency)
+
+    def _path(self, doc_id: str, tier: str) -> str:
+        name = hashlib.sha1(str(doc_id).encode()).hexdigest()
+        if tier == 'cold':
+            return os.path.join(self.cold_dir, f"{name}.json.gz")
+        return os.path.join(self.warm_dir, f"{name}.json")
+
+    def _write(self, doc_id: str, doc: Dict[str, Any], tier: str) -> None:
+        data = json.dumps(doc).encode()
+        if tier == 'cold':
+            data = gzip.compress(data)
+        path = self._path(doc_id, tier)
+        with open(path + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(path + ".tmp", path)
+
+    def _read(self, doc_id: str, tier: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(doc_id, tier), "rb") as f:
+                data = f.read()
+            if tier == 'cold':
+                data = gzip.decompress(data)
+            return json.loads(data)
+        except (OSError, ValueError):
+            return None
+
+    def _discard_files(self, doc_id: str) -> None:
+        for tier in ('warm', 'cold'):
+            try:
+                os.remove(self._path(doc_id, tier))
+            except FileNotFoundError:
+                pass
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.index_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self) -> None:
+        with open(self.index_path + ".tmp", "w") as f:
+            json.dump(self.index, f)
+        os.replace(self.index_path + ".tmp", self.index_path)
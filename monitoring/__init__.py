@@ -0,0 +1,4 @@
+from .health_check import HealthMonitor
+from .admission_control import AdmissionController
+
+__all__ = ['HealthMonitor', 'AdmissionController']
\ No newline at end of file
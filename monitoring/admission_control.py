@@ -0,0 +1,111 @@
+import time
+from typing import Dict, Any
+from .health_check import HealthMonitor
+
+class AdmissionController:
+    """Admits, degrades or sheds requests in front of the orchestrator"""
+    PRIORITIES = ('high', 'normal', 'low')
+
+    def __init__(self, orchestrator, health_monitor: HealthMonitor, max_in_flight: int = 16):
+        self.orchestrator = orchestrator
+        self.health_monitor = health_monitor
+        self.in_flight = 0
+        self.last_probe = 0.0
+        self.config = {
+            'max_in_flight': max_in_flight,
+            'queue_warning_ratio': 0.75,
+            'retry_after_seconds': 30,
+            'probe_interval_seconds': 15
+        }
+        self.metrics = {
+            'admitted': 0,
+            'degraded': 0,
+            'probed': 0,
+            'rejected': 0
+        }
+
+    async def process_request(self, request: str, priority: str = "normal") -> Dict[str, Any]:
+        """Run a request in full, documentation-only or reject it, based on load and priority"""
+        if priority not in self.PRIORITIES:
+            priority = "normal"
+
+        status = self.get_load_status()
+        decision = self._decide(status, priority)
+
+        if decision == 'reject':
+            self.metrics['rejected'] += 1
+            return self._prepare_rejected_response()
+
+        self.metrics[{'documentation_only': 'degraded', 'probe': 'probed'}.get(decision, 'admitted')] += 1
+        self.in_flight += 1
+        start_time = time.perf_counter()
+        error_details = None
+        try:
+            return await self.orchestrator.process_request(
+                request,
+                priority=priority,
+                documentation_only=decision == 'documentation_only'
+            )
+        except Exception as e:
+            error_details = str(e)
+            raise
+        finally:
+            self.in_flight -= 1
+            self.health_monitor.record_request(
+                time.perf_counter() - start_time,
+                error=error_details is not None,
+                error_details=error_details,
+                # Documentation-only answers are fast and would mask a slow workflow
+                source='documentation' if decision == 'documentation_only' else 'orchestrator'
+            )
+
+    def get_load_status(self) -> str:
+        """Combine live health status with queue depth"""
+        queue_ratio = self.in_flight / self.config['max_in_flight']
+        if queue_ratio >= 1:
+            return 'critical'
+
+        status = self.health_monitor.get_status()
+        if status == 'healthy' and queue_ratio >= self.config['queue_warning_ratio']:
+            return 'warning'
+        return status
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Admission counters and current queue depth"""
+        return {
+            **self.metrics,
+            'in_flight': self.in_flight,
+            'status': self.get_load_status()
+        }
+
+    def _decide(self, status: str, priority: str) -> str:
+        """Map load status and priority class to full, documentation_only, probe or reject"""
+        if status == 'healthy':
+            return 'full'
+        if status == 'warning':
+            return 'full' if priority == 'high' else 'documentation_only'
+        # Only high priority may probe, so no class is ever served better than high
+        if priority == 'high':
+            return 'probe' if self._probe_due() else 'documentation_only'
+        return 'reject'
+
+    def _probe_due(self) -> bool:
+        """Let one high priority request through in full per interval so latency samples reflect recovery"""
+        now = time.monotonic()
+        if (self.in_flight >= self.config['max_in_flight'] or
+                now - self.last_probe < self.config['probe_interval_seconds']):
+            return False
+        self.last_probe = now
+        return True
+
+    def _prepare_rejected_response(self) -> Dict[str, Any]:
+        """Fast rejection with a retry hint scaled by queue depth"""
+        queue_ratio = min(1.0, self.in_flight / self.config['max_in_flight'])
+        retry_after = int(self.config['retry_after_seconds'] * (1 + queue_ratio))
+        return {
+            "explanation": f"The system is overloaded. Please retry in {retry_after} seconds.",
+            "code": "",
+            "research_summary": "",
+            "source": "rejected",
+            "retry_after": retry_after
+        }
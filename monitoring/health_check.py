@@ -1,5 +1,5 @@
 import time
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 from datetime import datetime, timedelta
 import psutil
 import json
@@ -9,6 +9,7 @@ class HealthMonitor:
         self.metrics = {
             'memory_usage': [],
             'api_latency': [],
+            'request_latency': [],
             'request_count': 0,
             'errors': [],
             'last_memory_optimization': None
@@ -19,6 +20,9 @@ class HealthMonitor:
             'memory_critical': 95.0,
             'api_latency_warning': 2.0,  # seconds
             'api_latency_critical': 5.0,
+            'request_latency_warning': 30.0,  # seconds, full research + implementation
+            'request_latency_critical': 90.0,
+            'request_latency_window': 300,  # seconds of samples considered
             'error_rate_warning': 0.1,  # 10% error rate
             'error_rate_critical': 0.2
         }
@@ -29,9 +33,22 @@ class HealthMonitor:
             'status': self._get_overall_status(),
             'memory': self._check_memory(),
             'api': self._check_api_health(),
+            'requests': self._check_request_health(),
             'system': self._check_system_health()
         }
 
+    def get_status(self) -> str:
+        """Worst of overall, API and request latency status, for admission decisions"""
+        statuses = [
+            self._get_overall_status(),
+            self._check_api_health()['status'],
+            self._check_request_health()['status']
+        ]
+        for level in ('critical', 'warning'):
+            if level in statuses:
+                return level
+        return 'healthy'
+
     def _get_overall_status(self) -> str:
         """Calculate overall system status"""
         memory_usage = psutil.virtual_memory().percent
@@ -74,6 +91,25 @@ class HealthMonitor:
             'status': self._get_api_status(avg_latency)
         }
 
+    def _check_request_health(self) -> Dict[str, Any]:
+        """Check end-to-end request latency over the recent time window"""
+        latencies = [latency for _, latency in self._get_recent_request_latency()]
+        avg_latency = sum(latencies) / len(latencies) if latencies else 0
+        
+        return {
+            'average_latency': avg_latency,
+            'samples': len(latencies),
+            'status': self._get_request_status(avg_latency)
+        }
+
+    def _get_recent_request_latency(self) -> List[Tuple[datetime, float]]:
+        """Drop request latency samples older than the window and return the rest"""
+        cutoff = datetime.now() - timedelta(seconds=self.thresholds['request_latency_window'])
+        self.metrics['request_latency'] = [
+            sample for sample in self.metrics['request_latency'] if sample[0] >= cutoff
+        ]
+        return self.metrics['request_latency']
+
     def _check_system_health(self) -> Dict[str, Any]:
         """Check overall system health"""
         cpu_usage = psutil.cpu_percent(interval=1)
@@ -110,6 +146,14 @@ class HealthMonitor:
             return 'warning'
         return 'healthy'
 
+    def _get_request_status(self, latency: float) -> str:
+        """Determine request status based on end-to-end latency"""
+        if latency > self.thresholds['request_latency_critical']:
+            return 'critical'
+        elif latency > self.thresholds['request_latency_warning']:
+            return 'warning'
+        return 'healthy'
+
     def _get_system_status(self, cpu_usage: float, disk_usage: float) -> str:
         """Determine system status based on CPU and disk usage"""
         if cpu_usage > 90 or disk_usage > 90:
@@ -125,14 +169,24 @@ class HealthMonitor:
         hours = int((uptime % (24 * 3600)) // 3600)
         return f"{days}d {hours}h"
 
-    def record_request(self, latency: float, error: bool = False, error_details: str = None):
-        """Record API request metrics"""
+    def record_request(self, latency: float, error: bool = False, error_details: str = None,
+                       source: str = 'api'):
+        """Record request metrics
+
+        'orchestrator' latency is tracked as end-to-end request latency and
+        'api' latency as API latency; other sources only count towards the
+        request and error totals.
+        """
         self.metrics['request_count'] += 1
-        self.metrics['api_latency'].append(latency)
-        
-        # Keep only last 1000 latency measurements
-        if len(self.metrics['api_latency']) > 1000:
-            self.metrics['api_latency'] = self.metrics['api_latency'][-1000:]
+        if source == 'orchestrator':
+            self.metrics['request_latency'].append((datetime.now(), latency))
+            self._get_recent_request_latency()
+        elif source == 'api':
+            self.metrics['api_latency'].append(latency)
+            
+            # Keep only last 1000 latency measurements
+            if len(self.metrics['api_latency']) > 1000:
+                self.metrics['api_latency'] = self.metrics['api_latency'][-1000:]
             
         if error:
             self.metrics['errors'].append({